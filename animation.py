@@ -0,0 +1,87 @@
+# animation.py - Precomputed animation clips advanced by elapsed time
+
+import pygame
+
+
+class AnimationClip:
+    """Immutable sequence of frames shown for a fixed duration each"""
+    __slots__ = ('frames', 'frame_duration', 'loop')
+
+    def __init__(self, frames, frame_duration, loop=True):
+        if not frames:
+            raise ValueError("An animation clip needs at least one frame")
+        self.frames = tuple(frames)
+        self.frame_duration = frame_duration  # milliseconds
+        self.loop = loop
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def duration(self):
+        return self.frame_duration * len(self.frames)
+
+    def index_at(self, elapsed):
+        index = int(elapsed // self.frame_duration)
+        if self.loop:
+            return index % len(self.frames)
+        return min(index, len(self.frames) - 1)
+
+    def frame_at(self, elapsed):
+        return self.frames[self.index_at(elapsed)]
+
+
+class Animator:
+    """Plays one clip of a clip set at a time, driven by elapsed milliseconds"""
+
+    def __init__(self, clips, clip_name):
+        self.clips = clips
+        self.clip_name = clip_name
+        self.clip = clips[clip_name]
+        self.elapsed = 0
+
+    def play(self, clip_name, restart=False):
+        if clip_name != self.clip_name:
+            self.clip_name = clip_name
+            self.clip = self.clips[clip_name]
+            restart = True
+        if restart:
+            self.elapsed = 0
+
+    def update(self, dt):
+        self.elapsed += dt
+        if self.clip.loop and self.elapsed >= self.clip.duration:
+            self.elapsed %= self.clip.duration
+
+    @property
+    def frame_index(self):
+        return self.clip.index_at(self.elapsed)
+
+    @property
+    def frame(self):
+        return self.clip.frame_at(self.elapsed)
+
+
+def slice_row(sheet, row, frame_width, frame_height, count):
+    """Return count frames from one sheet row as subsurfaces sharing the sheet's pixels"""
+    return tuple(
+        sheet.subsurface(pygame.Rect(col * frame_width, row * frame_height, frame_width, frame_height))
+        for col in range(count)
+    )
+
+
+def slice_clips(sheet, rows, frame_width, frame_height, count, frame_duration):
+    """Build a {name: AnimationClip} set from a sheet laid out one clip per row.
+
+    Rows past the bottom of the sheet reuse the first row so a partial sheet
+    still yields a complete clip set.
+    """
+    available_rows = sheet.get_height() // frame_height
+    count = min(count, sheet.get_width() // frame_width)
+    clips = {}
+    for name, row in rows.items():
+        if row >= available_rows:
+            row = 0
+        clips[name] = AnimationClip(slice_row(sheet, row, frame_width, frame_height, count), frame_duration)
+    return clips
+
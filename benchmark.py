@@ -0,0 +1,248 @@
+# benchmark.py - Headless benchmarks for the render and update hot paths
+#
+# Usage:
+#   python benchmark.py                      # run and compare with the baseline if present
+#   python benchmark.py --save-baseline      # run and store results as the new baseline
+#   python benchmark.py --frames 600 --objects 2000 --crowd 1000 --tolerance 0.15
+
+import os
+
+# Must be set before pygame creates a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import logging
+import random
+import sys
+import time
+import tracemalloc
+
+import pygame
+import main as game
+from crowd import Crowd
+from game_objects import GameObject
+from game_world import create_game_world
+from resume_data import RESUME_DATA
+from sprites import get_rock_sprite
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+
+
+class ScriptedKeys:
+    """Stands in for pygame.key.get_pressed(), holding one key at a time"""
+
+    def __init__(self):
+        self.held = None
+
+    def __getitem__(self, key):
+        return key == self.held
+
+
+WALK_CYCLE = [pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP]
+
+
+def walk_step(i, keys):
+    keys.held = WALK_CYCLE[(i // 30) % len(WALK_CYCLE)]
+    game.update_world(keys, game.TICK_MS)
+    game.interpolate_world(1.0)
+
+
+def scroll_step(i, keys):
+    # Down through the list, back to the top, and again
+    game.resume_display.handle_key(pygame.K_HOME if i % 240 == 0 else pygame.K_DOWN)
+
+
+def reset_state():
+    game.in_main_menu = False
+    game.dialog_system.active = False
+    game.menu_system.close()
+    game.resume_display.close()
+    game.needs_full_redraw = True
+
+
+def setup_main_menu(args):
+    reset_state()
+    game.in_main_menu = True
+    game.menu_system.show_menu("Interactive Resume", ["Start Game", "About", "Exit"], game.handle_menu_selection)
+
+
+def setup_paused_menu(args):
+    reset_state()
+    game.menu_system.show_menu("Paused", ["Resume", "Controls", "Exit"], game.handle_menu_selection)
+
+
+def setup_long_dialog(args):
+    reset_state()
+    text = " ".join(f"Entry {i}: {RESUME_DATA['PERSONAL_SUMMARY']}" for i in range(12))
+    game.dialog_system.show_dialog("Benchmark", text)
+
+
+def setup_long_projects(args):
+    reset_state()
+    base = RESUME_DATA["PROJECTS"]
+    projects = [dict(base[i % len(base)], name=f"Project {i}",
+                     description=" ".join([base[i % len(base)]["description"]] * (1 + i % 4)))
+                for i in range(args.projects)]
+    game.resume_display.invalidate("Projects")
+    game.resume_display.show_section("Projects", projects)
+
+
+def make_resume_setup(section, key):
+    def setup(args):
+        reset_state()
+        game.resume_display.show_section(section, RESUME_DATA[key] if key else None)
+    return setup
+
+
+def setup_world(args):
+    reset_state()
+    rng = random.Random(args.seed)
+    world = create_game_world()
+    rock = get_rock_sprite()
+    for _ in range(args.objects):
+        x = rng.randrange(32, game.SCREEN_WIDTH - 48)
+        y = rng.randrange(32, game.SCREEN_HEIGHT - 48)
+        world.add_object(GameObject(x, y, 16, 16, rock, "Rock"))
+    # Keep the player's spawn point clear so it can walk around
+    spawn = pygame.Rect(game.SCREEN_WIDTH // 2 - 64, game.SCREEN_HEIGHT // 2 - 64, 160, 160)
+    for obj in world.query_rect(spawn):
+        world.remove_object(obj)
+    game.game_world = world
+    game.player.place(game.SCREEN_WIDTH // 2, game.SCREEN_HEIGHT // 2)
+
+
+def setup_crowd(args):
+    reset_state()
+    world = create_game_world()
+    world.crowd = Crowd(world, args.crowd, seed=args.seed)
+    game.game_world = world
+    game.player.place(game.SCREEN_WIDTH // 2, game.SCREEN_HEIGHT // 2)
+
+
+SCENARIOS = [
+    ("main_menu", setup_main_menu, None),
+    ("paused_menu", setup_paused_menu, None),
+    ("long_dialog", setup_long_dialog, None),
+    ("resume_skills", make_resume_setup("Skills", "SKILLS"), None),
+    ("resume_experience", make_resume_setup("Experience", "EXPERIENCE"), None),
+    ("resume_education", make_resume_setup("Education", "EDUCATION"), None),
+    ("resume_projects", make_resume_setup("Projects", "PROJECTS"), None),
+    ("resume_contact", make_resume_setup("Contact", "CONTACT"), None),
+    ("resume_about", make_resume_setup("About Me", None), None),
+    ("resume_long_projects", setup_long_projects, scroll_step),
+    ("world", setup_world, walk_step),
+    ("crowd", setup_crowd, walk_step),
+]
+
+
+def run_frames(frames, step):
+    keys = ScriptedKeys()
+    for i in range(frames):
+        if step:
+            step(i, keys)
+        dirty_rects = game.render_game()
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
+
+
+def run_scenario(name, setup, step, args):
+    setup(args)
+    run_frames(args.warmup, step)
+
+    setup(args)
+    start = time.perf_counter()
+    run_frames(args.frames, step)
+    elapsed = time.perf_counter() - start
+
+    # Allocation pass is separate: tracing slows everything down
+    setup(args)
+    tracemalloc.start()
+    before_blocks = sys.getallocatedblocks()
+    run_frames(args.frames, step)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    net_blocks = sys.getallocatedblocks() - before_blocks
+
+    return {
+        "fps": args.frames / elapsed if elapsed else float("inf"),
+        "ms_per_frame": elapsed * 1000 / args.frames,
+        "peak_alloc_kb": peak / 1024,
+        "net_blocks_per_frame": net_blocks / args.frames,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return the names of scenarios slower than baseline by more than tolerance"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        limit = reference["ms_per_frame"] * (1 + tolerance)
+        if result["ms_per_frame"] > limit:
+            regressions.append(name)
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless render/update benchmarks")
+    parser.add_argument("--frames", type=int, default=300, help="timed frames per scenario")
+    parser.add_argument("--warmup", type=int, default=30, help="untimed frames before timing")
+    parser.add_argument("--objects", type=int, default=500, help="extra objects in the world scenario")
+    parser.add_argument("--projects", type=int, default=60, help="entries in the long project list scenario")
+    parser.add_argument("--crowd", type=int, default=300, help="wandering NPCs in the crowd scenario")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--scenario", action="append", help="run only the named scenario(s)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="store results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown, e.g. 0.10 = 10%%")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    args.baseline = os.path.abspath(args.baseline)
+    # Asset paths are relative to the game directory
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    logging.getLogger().setLevel(logging.WARNING)
+    if not game.initialize_game():
+        logger.error("Game initialization failed")
+        return 2
+
+    selected = [s for s in SCENARIOS if not args.scenario or s[0] in args.scenario]
+    results = {}
+    print(f"{'scenario':<20}{'fps':>10}{'ms/frame':>10}{'peak KB':>10}{'blocks/f':>10}")
+    for name, setup, step in selected:
+        result = run_scenario(name, setup, step, args)
+        results[name] = result
+        print(f"{name:<20}{result['fps']:>10.1f}{result['ms_per_frame']:>10.3f}"
+              f"{result['peak_alloc_kb']:>10.1f}{result['net_blocks_per_frame']:>10.2f}")
+
+    status = 0
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for name in regressions:
+            print(f"REGRESSION {name}: {results[name]['ms_per_frame']:.3f} ms/frame "
+                  f"vs baseline {baseline[name]['ms_per_frame']:.3f}")
+        status = 1 if regressions else 0
+        if not regressions:
+            print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+
+    pygame.quit()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
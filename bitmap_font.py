@@ -0,0 +1,118 @@
+# bitmap_font.py - Bitmap font renderer driven by static/gfx/gfx/font.png
+
+import logging
+import pygame
+
+logger = logging.getLogger(__name__)
+
+# Glyph cells on the sheet: (characters, x, y, cell width, cell height), laid out left to right
+CELL_WIDTH = 8
+GLYPH_ROWS = [
+    ("AaBbCcDdEeFfGgHhIiJjKkLlMm", 0, 0, CELL_WIDTH, 16),
+    ("NnOoPpQqRrSsTtUuVvWwXxYyZz", 0, 16, CELL_WIDTH, 16),
+    (".,!¡?¿#_-▼:;'\"", 0, 32, CELL_WIDTH, 16),
+    ("012", 216, 0, CELL_WIDTH, 8),
+    ("345", 216, 8, CELL_WIDTH, 8),
+    ("678", 216, 16, CELL_WIDTH, 8),
+    ("9", 224, 24, CELL_WIDTH, 8),
+]
+ATLAS_HEIGHT = 48  # Rows below this hold the dialog frame, not glyphs
+LINE_HEIGHT = 16
+SPACE_ADVANCE = 4
+LETTER_SPACING = 1
+MISSING_GLYPH = "?"
+
+def get_font_sheet():
+    # Imported here: sprites imports config, which imports this module
+    from sprites import get_region
+    return get_region('font')
+
+
+class BitmapFont:
+    """Renders text by blitting glyphs from a pre-scaled atlas.
+
+    Exposes render/size/get_linesize/get_height like pygame.font.Font so it
+    can be passed anywhere the UI expects a font.
+    """
+
+    def __init__(self, scale=2):
+        self.scale = scale
+        self.glyphs = {}  # char -> glyph rect in the atlas
+        self.tinted_atlases = {}  # color -> tinted copy of the atlas
+        self.atlas = self.build_atlas(get_font_sheet())
+        self.warned = set()
+
+    def build_atlas(self, sheet):
+        """Scale the glyph area once and record a trimmed rect for every glyph"""
+        glyph_area = sheet.subsurface(pygame.Rect(0, 0, sheet.get_width(), ATLAS_HEIGHT))
+        atlas = pygame.transform.scale(glyph_area, (glyph_area.get_width() * self.scale,
+                                                    ATLAS_HEIGHT * self.scale))
+        # White mask keeps only the alpha, so tinting is a single multiply
+        atlas.fill((255, 255, 255, 0), special_flags=pygame.BLEND_RGBA_MAX)
+
+        for chars, left, top, width, height in GLYPH_ROWS:
+            for i, char in enumerate(chars):
+                cell = pygame.Rect(left + i * width, top, width, height)
+                columns = [x for x in range(cell.left, cell.right)
+                           if any(sheet.get_at((x, y)).a for y in range(cell.top, cell.bottom))]
+                if columns:
+                    cell.left, cell.width = columns[0], columns[-1] - columns[0] + 1
+                self.glyphs[char] = pygame.Rect(cell.left * self.scale, cell.top * self.scale,
+                                                cell.width * self.scale, cell.height * self.scale)
+        return atlas
+
+    def get_tinted_atlas(self, color):
+        key = tuple(color)
+        atlas = self.tinted_atlases.get(key)
+        if atlas is None:
+            atlas = self.atlas.copy()
+            rgba = key if len(key) == 4 else key + (255,)
+            atlas.fill(rgba, special_flags=pygame.BLEND_RGBA_MULT)
+            self.tinted_atlases[key] = atlas
+        return atlas
+
+    def glyph(self, char):
+        rect = self.glyphs.get(char)
+        if rect is None:
+            if char not in self.warned:
+                logger.warning(f"Bitmap font has no glyph for {char!r}")
+                self.warned.add(char)
+            rect = self.glyphs[MISSING_GLYPH]
+        return rect
+
+    def layout(self, text):
+        """Return (glyph rect, x) pairs and the total advance width"""
+        placements = []
+        x = 0
+        after_glyph = False
+        for char in text:
+            if char == " ":
+                x += SPACE_ADVANCE * self.scale
+                after_glyph = False
+                continue
+            if after_glyph:
+                x += LETTER_SPACING * self.scale
+            rect = self.glyph(char)
+            placements.append((rect, x))
+            x += rect.width
+            after_glyph = True
+        return placements, x
+
+    def size(self, text):
+        return (self.layout(text)[1], self.get_height())
+
+    def get_height(self):
+        return LINE_HEIGHT * self.scale
+
+    def get_linesize(self):
+        return LINE_HEIGHT * self.scale
+
+    def render(self, text, antialias, color, background=None):
+        """Render text in one Surface.blits call; antialias is accepted for API parity"""
+        placements, width = self.layout(text)
+        surface = pygame.Surface((max(width, 1), self.get_height()), pygame.SRCALPHA)
+        if background is not None:
+            surface.fill(background)
+        atlas = self.get_tinted_atlas(color)
+        surface.blits([(atlas, (x, 0), rect) for rect, x in placements], doreturn=False)
+        return surface
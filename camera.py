@@ -0,0 +1,44 @@
+# camera.py - Viewport that follows the player through the world
+
+import pygame
+from config import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+class Camera:
+    """A screen-sized window onto the world, in world pixels.
+
+    Renderers draw world things at (x - camera.x, y - camera.y) and skip
+    anything whose rect misses camera.rect.
+    """
+
+    def __init__(self, view_size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.rect = pygame.Rect((0, 0), view_size)
+
+    @property
+    def offset(self):
+        return self.rect.topleft
+
+    def follow(self, target_rect, world_size):
+        """Center on target_rect, clamped so the view never leaves the world.
+
+        A world smaller than the view is centered instead.
+        """
+        world_w, world_h = world_size
+        if world_w <= self.rect.width:
+            x = (world_w - self.rect.width) // 2
+        else:
+            x = max(0, min(world_w - self.rect.width, target_rect.centerx - self.rect.width // 2))
+        if world_h <= self.rect.height:
+            y = (world_h - self.rect.height) // 2
+        else:
+            y = max(0, min(world_h - self.rect.height, target_rect.centery - self.rect.height // 2))
+        self.rect.topleft = (x, y)
+
+    def is_visible(self, rect):
+        return self.rect.colliderect(rect)
+
+    def world_to_screen(self, rect):
+        return rect.move(-self.rect.x, -self.rect.y)
+
+    def screen_to_world(self, pos):
+        return (pos[0] + self.rect.x, pos[1] + self.rect.y)
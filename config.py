@@ -3,15 +3,40 @@
 import pygame
 import logging
 import os
+import json
+from collections import OrderedDict
+from bitmap_font import BitmapFont
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Screen dimensions
+# Screen dimensions (native game resolution; all layout uses these)
 SCREEN_WIDTH = 960
 SCREEN_HEIGHT = 720
 
+# World layout (see world_loader.py) and its compiled cache
+WORLD_DATA_PATH = 'world.json'
+WORLD_CACHE_PATH = '.world_cache.bin'
+
+# Areas left since longest are unloaded while loaded areas exceed this many bytes
+AREA_MEMORY_BUDGET = 24 * 1024 * 1024
+# Length of the fade out + fade in when moving between areas (ms)
+AREA_FADE_MS = 400
+
+# Wandering crowd NPCs: walking speed (px/s), how long walks and pauses last (ms range),
+# walk cycle frame time (ms) and how many times a blocked spawn point is re-rolled
+CROWD_SPEED = 40
+CROWD_WALK_MS = (800, 2500)
+CROWD_IDLE_MS = (500, 2000)
+CROWD_FRAME_MS = 150
+CROWD_SPAWN_ATTEMPTS = 8
+
+# Window size as a multiple of the native resolution
+WINDOW_SCALE = 1
+# Upscale by whole multiples only (crisp pixels), letterboxing the rest
+INTEGER_SCALING = True
+
 # Colors
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -24,7 +49,67 @@ DARK_GRAY = (64, 64, 64)
 LIGHT_BLUE = (173, 216, 230)
 
 # Game settings
-FPS = 60
+FPS = 60  # Frame rate cap on desktop; the browser paces frames itself
+
+# The simulation advances in fixed ticks whatever the frame rate. A slow frame
+# runs several ticks to catch up, but never more than SIMULATION_MAX_TICKS;
+# time beyond that is dropped so one stall cannot snowball into the next.
+SIMULATION_HZ = 60
+TICK_MS = 1000 / SIMULATION_HZ
+SIMULATION_MAX_TICKS = 5
+
+# While nothing on screen can change, the loop stops drawing and sleeps until input
+# arrives, waking at least this often (ms) to check on the game
+IDLE_HEARTBEAT_MS = 250
+
+# Player walking speed in pixels per second
+PLAYER_SPEED = 180
+
+# Cell size in pixels for the GameArea spatial index
+SPATIAL_CELL_SIZE = 64
+
+# Tile maps: tile edge in pixels, chunk edge in tiles, and how many chunk surfaces stay cached
+TILE_SIZE = 16
+TILEMAP_CHUNK_TILES = 16
+TILEMAP_CHUNK_CACHE = 64
+
+# Resume content files (see resume_loader.py). With hot reload on, the desktop game polls
+# them at most every RESUME_RELOAD_INTERVAL_MS and redraws the sections that changed.
+RESUME_DATA_DIR = 'resume'
+RESUME_HOT_RELOAD = True
+RESUME_RELOAD_INTERVAL_MS = 500
+
+# Resume lists: pixels scrolled per arrow key or wheel notch, and how far past the
+# visible window entries are laid out and rasterized ahead of time
+RESUME_SCROLL_STEP = 40
+RESUME_LIST_OVERSCAN = 200
+
+# Dialog typewriter reveal speed in characters per second (0 shows pages instantly)
+DIALOG_TYPEWRITER_CPS = 0
+
+# Worker threads used to decode images while the menu is shown (desktop only)
+LOADER_THREADS = 4
+
+# Redraw only regions touched by moving things while no UI overlay is open
+DIRTY_RECT_RENDERING = True
+
+# Frame timing instrumentation
+FRAME_STATS_WINDOW = 600  # frames kept for rolling percentiles
+FRAME_HUD_REFRESH_MS = 500
+FRAME_STATS_EXPORT_PATH = None  # .json or .csv path written on exit; main.py --frame-stats sets it per run
+
+# Text surface cache settings (LRU, bounded by entry count and pixel bytes)
+TEXT_CACHE_MAX_ENTRIES = 512
+TEXT_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
+# Font discovery
+FONT_PREFERENCES = ['courier', 'arial', 'helvetica']
+FONT_CACHE_PATH = '.font_cache.json'  # Resolved font path, reused across runs
+
+# Render UI text with the bundled bitmap font (static/gfx/gfx/font.png) instead of TTF.
+# The sheet only covers letters, digits and basic punctuation.
+USE_BITMAP_FONT = False
+BITMAP_FONT_SCALES = {"small": 2, "medium": 3, "large": 4}
 
 # Font variables
 small_font = None
@@ -32,29 +117,77 @@ medium_font = None
 large_font = None
 
 
-def get_font(size):
-    """Helper function to get a font with multiple fallback options"""
+_font_path = None
+_fonts = {}
+
+
+def load_font_cache():
+    """Return the cached font path if it is still valid, otherwise None"""
+    try:
+        with open(FONT_CACHE_PATH) as f:
+            cached = json.load(f)
+        if cached.get("preferences") != FONT_PREFERENCES:
+            return None
+        font_path = cached["path"]
+        if cached.get("mtime") is not None and os.path.getmtime(font_path) != cached["mtime"]:
+            return None
+        return font_path
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_font_cache(font_path, mtime):
     try:
-        # First try: Look for specific fonts in order of preference
-        for font_name in ['courier', 'arial', 'helvetica']:
-            font_path = pygame.font.match_font(font_name)
-            if font_path and os.path.exists(font_path):
-                logger.info(f"Using font: {font_name} from {font_path}")
-                return pygame.font.Font(font_path, size)
-
-        # Second try: Use default system font
-        default_font = pygame.font.get_default_font()
-        if default_font:
-            logger.info(f"Using default system font: {default_font}")
-            return pygame.font.Font(default_font, size)
-
-        # Last resort: Use SysFont
-        logger.info("Falling back to SysFont")
-        return pygame.font.SysFont(None, size)
+        with open(FONT_CACHE_PATH, "w") as f:
+            json.dump({"preferences": FONT_PREFERENCES, "path": font_path, "mtime": mtime}, f)
+    except OSError as e:
+        logger.warning(f"Could not write font cache: {str(e)}")
 
+
+def discover_font_path():
+    """Find the preferred font by querying the system font list"""
+    # First try: Look for specific fonts in order of preference
+    for font_name in FONT_PREFERENCES:
+        font_path = pygame.font.match_font(font_name)
+        if font_path and os.path.exists(font_path):
+            logger.info(f"Using font: {font_name} from {font_path}")
+            return font_path, os.path.getmtime(font_path)
+
+    # Second try: Use default pygame font
+    default_font = pygame.font.get_default_font()
+    logger.info(f"Using default system font: {default_font}")
+    return default_font, None
+
+
+def resolve_font_path():
+    """Resolve the font file once per process, consulting the on-disk cache first"""
+    global _font_path
+    if _font_path is None:
+        cached_path = load_font_cache()
+        if cached_path is not None:
+            logger.info(f"Using cached font: {cached_path}")
+            _font_path = cached_path
+        else:
+            _font_path, mtime = discover_font_path()
+            save_font_cache(_font_path, mtime)
+    return _font_path
+
+
+def get_font(size):
+    """Helper function to get a font with multiple fallback options.
+
+    Fonts are created lazily per size from the resolved font path.
+    """
+    font = _fonts.get(size)
+    if font is not None:
+        return font
+    try:
+        font = pygame.font.Font(resolve_font_path(), size)
     except Exception as e:
         logger.error(f"Error creating font of size {size}: {str(e)}")
-        return pygame.font.SysFont(None, size)
+        font = pygame.font.SysFont(None, size)
+    _fonts[size] = font
+    return font
 
 
 def initialize_fonts():
@@ -74,9 +207,14 @@ def initialize_fonts():
 
     try:
         # Set up fonts with specific sizes
-        small_font = get_font(16)
-        medium_font = get_font(24)
-        large_font = get_font(32)
+        if USE_BITMAP_FONT:
+            small_font = BitmapFont(BITMAP_FONT_SCALES["small"])
+            medium_font = BitmapFont(BITMAP_FONT_SCALES["medium"])
+            large_font = BitmapFont(BITMAP_FONT_SCALES["large"])
+        else:
+            small_font = get_font(16)
+            medium_font = get_font(24)
+            large_font = get_font(32)
 
         # Test each font
         for font, size in [(small_font, "small"), (medium_font, "medium"), (large_font, "large")]:
@@ -97,20 +235,94 @@ def initialize_fonts():
         return True
 
 
-def create_pixel_text(text, font, color):
-    """Create a pixel art style text surface with fallback handling"""
+class TextSurfaceCache:
+    """LRU cache of rendered text surfaces keyed by (text, font, color, antialias)"""
+
+    def __init__(self, max_entries=TEXT_CACHE_MAX_ENTRIES, max_bytes=TEXT_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._surfaces = OrderedDict()
+
+    @staticmethod
+    def surface_bytes(surface):
+        return surface.get_pitch() * surface.get_height()
+
+    def get(self, key):
+        surface = self._surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self._surfaces.move_to_end(key)
+        self.hits += 1
+        return surface
+
+    def put(self, key, surface):
+        if key in self._surfaces:
+            self.current_bytes -= self.surface_bytes(self._surfaces.pop(key))
+        size = self.surface_bytes(surface)
+        if size > self.max_bytes:
+            # Never worth caching: it would evict everything else
+            return surface
+        self._surfaces[key] = surface
+        self.current_bytes += size
+        while len(self._surfaces) > self.max_entries or self.current_bytes > self.max_bytes:
+            _, evicted = self._surfaces.popitem(last=False)
+            self.current_bytes -= self.surface_bytes(evicted)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+        self.current_bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._surfaces),
+            "bytes": self.current_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+text_cache = TextSurfaceCache()
+_fallback_font = None
+
+
+def get_fallback_font():
+    """Return a shared emergency font so fallbacks stay cacheable"""
+    global _fallback_font
+    if _fallback_font is None:
+        _fallback_font = pygame.font.SysFont(None, 32)
+    return _fallback_font
+
+
+def create_pixel_text(text, font, color, antialias=True):
+    """Create a pixel art style text surface with fallback handling.
+
+    Surfaces are shared through text_cache, so callers must treat the
+    result as read-only (blit it, never draw on it).
+    """
     try:
         if font is None:
             logger.warning("Font is None, using fallback system font")
-            font = pygame.font.SysFont(None, 32)
+            font = get_fallback_font()
+
+        key = (text, font, tuple(color), antialias)
+        text_surface = text_cache.get(key)
+        if text_surface is not None:
+            return text_surface
 
-        text_surface = font.render(text, True, color)
+        text_surface = font.render(text, antialias, color)
         if text_surface is None:
             raise ValueError("Text surface is None after rendering")
 
-        return text_surface
+        return text_cache.put(key, text_surface)
 
     except Exception as e:
         logger.error(f"Error in create_pixel_text: {str(e)}")
-        emergency_font = pygame.font.SysFont(None, 32)
-        return emergency_font.render(text, True, color)
\ No newline at end of file
+        return get_fallback_font().render(text, antialias, color)
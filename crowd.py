@@ -0,0 +1,173 @@
+# crowd.py - Wandering NPCs simulated in batches with NumPy
+
+import logging
+import numpy as np
+from animation import slice_row
+from config import CROWD_SPEED, CROWD_WALK_MS, CROWD_IDLE_MS, CROWD_FRAME_MS, CROWD_SPAWN_ATTEMPTS
+from sprites import get_region, CROWD_FRAME_WIDTH, CROWD_FRAME_HEIGHT, CROWD_DIRECTIONS, \
+    CROWD_FRAMES_PER_DIRECTION
+
+logger = logging.getLogger(__name__)
+
+IDLE, WALK = 0, 1
+# Unit step per direction index, in CROWD_DIRECTIONS order (down, right, up, left)
+STEPS = np.array([(0, 1), (1, 0), (0, -1), (-1, 0)], dtype=np.float32)
+# Collision box inside a frame (x, y, w, h): just the feet, so heads can overlap what is behind them.
+# It must not be larger than a tile; collisions only sample its corners.
+HITBOX = (2, 22, 12, 10)
+
+
+def load_frames():
+    """Return frames[direction][frame] sliced from the crowd sheet"""
+    sheet = get_region('crowd')
+    return [slice_row(sheet, row, CROWD_FRAME_WIDTH, CROWD_FRAME_HEIGHT, CROWD_FRAMES_PER_DIRECTION)
+            for row in range(len(CROWD_DIRECTIONS))]
+
+
+class Crowd:
+    """Wandering NPCs held as parallel arrays, one row per NPC.
+
+    Each tick advances all of them at once: behaviour timers, velocities,
+    movement and collision tests are array operations, so hundreds of NPCs
+    cost a handful of NumPy calls rather than a Python loop each. An NPC
+    walks one way for a while, stops, then sets off in a new direction;
+    one that would walk into the map edge, a solid tile, a solid object or
+    an actor stays put and turns instead.
+    """
+
+    def __init__(self, area, count, seed=0, speed=CROWD_SPEED):
+        self.area = area
+        self.speed = speed / 1000  # px per ms
+        self.rng = np.random.default_rng(seed)
+        self.frames = load_frames()
+        self.positions = np.zeros((count, 2), dtype=np.float32)  # Frame top left, world pixels
+        self.velocities = np.zeros((count, 2), dtype=np.float32)  # px per ms
+        self.directions = self.rng.integers(0, len(STEPS), count).astype(np.int8)
+        self.states = np.full(count, IDLE, dtype=np.int8)
+        self.timers = self.rng.uniform(*CROWD_IDLE_MS, count).astype(np.float32)  # ms left in the state
+        self.anim_elapsed = np.zeros(count, dtype=np.float32)
+        self.obstacles = np.empty((0, 4), dtype=np.float32)  # Solid object rects as left, top, right, bottom
+        self.obstacles_version = None
+        self.spawn()
+        self.previous = self.positions.copy()  # Positions before the last update
+        self.draw_positions = self.positions.copy()  # Interpolated between previous and positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def get_obstacles(self):
+        """Solid object rects of the area, rebuilt only after its objects change"""
+        if self.obstacles_version != self.area.objects_version:
+            rects = [(r.left, r.top, r.right, r.bottom) for r in (obj.rect for obj in self.area.objects if obj.solid)]
+            self.obstacles = np.array(rects, dtype=np.float32).reshape(-1, 4)
+            self.obstacles_version = self.area.objects_version
+        return self.obstacles
+
+    def collisions(self, positions, extra_rects=()):
+        """Mask of the positions whose hitbox leaves the area or hits a solid tile, object or extra rect"""
+        left = np.floor(positions[:, 0]) + HITBOX[0]
+        top = np.floor(positions[:, 1]) + HITBOX[1]
+        right = left + HITBOX[2]
+        bottom = top + HITBOX[3]
+        width, height = self.area.size
+        hit = (left < 0) | (top < 0) | (right > width) | (bottom > height)
+
+        tilemap = self.area.tilemap
+        if tilemap is not None:
+            solid = np.frombuffer(tilemap.solid, dtype=np.uint8).reshape(tilemap.height, tilemap.width)
+            size = tilemap.tile_size
+            x0 = np.clip(left // size, 0, tilemap.width - 1).astype(np.intp)
+            y0 = np.clip(top // size, 0, tilemap.height - 1).astype(np.intp)
+            x1 = np.clip((right - 1) // size, 0, tilemap.width - 1).astype(np.intp)
+            y1 = np.clip((bottom - 1) // size, 0, tilemap.height - 1).astype(np.intp)
+            hit |= (solid[y0, x0] | solid[y0, x1] | solid[y1, x0] | solid[y1, x1]).astype(bool)
+
+        obstacles = self.get_obstacles()
+        if extra_rects:
+            extra = np.array([(r.left, r.top, r.right, r.bottom) for r in extra_rects], dtype=np.float32)
+            obstacles = np.concatenate((obstacles, extra))
+        if len(obstacles):
+            # Every hitbox against every rect in one broadcast
+            hit |= ((left[:, None] < obstacles[:, 2]) & (right[:, None] > obstacles[:, 0])
+                    & (top[:, None] < obstacles[:, 3]) & (bottom[:, None] > obstacles[:, 1])).any(axis=1)
+        return hit
+
+    def spawn(self):
+        """Scatter the NPCs over free ground, re-rolling those that land on something"""
+        width, height = self.area.size
+        pending = np.arange(len(self))
+        for _ in range(CROWD_SPAWN_ATTEMPTS):
+            self.positions[pending, 0] = self.rng.uniform(0, width - CROWD_FRAME_WIDTH, len(pending))
+            self.positions[pending, 1] = self.rng.uniform(0, height - CROWD_FRAME_HEIGHT, len(pending))
+            pending = pending[self.collisions(self.positions[pending])]
+            if not len(pending):
+                return
+        logger.warning(f"No room for {len(pending)} of {len(self)} crowd NPCs in {self.area.name}")
+        self.keep(np.setdiff1d(np.arange(len(self)), pending))
+
+    def keep(self, indices):
+        for name in ("positions", "velocities", "directions", "states", "timers", "anim_elapsed"):
+            setattr(self, name, getattr(self, name)[indices])
+
+    def update(self, dt, actors=()):
+        """Advance every NPC by dt milliseconds, steering clear of the actors' rects"""
+        if not len(self):
+            return
+        np.copyto(self.previous, self.positions)
+        self.timers -= dt
+        expired = np.flatnonzero(self.timers <= 0)
+        if len(expired):
+            # Walkers stop; idlers set off in a random direction
+            was_walking = self.states[expired] == WALK
+            count = len(expired)
+            self.states[expired] = np.where(was_walking, IDLE, WALK)
+            self.directions[expired] = np.where(was_walking, self.directions[expired],
+                                                self.rng.integers(0, len(STEPS), count))
+            self.timers[expired] = np.where(was_walking, self.rng.uniform(*CROWD_IDLE_MS, count),
+                                            self.rng.uniform(*CROWD_WALK_MS, count))
+            self.anim_elapsed[expired] = 0
+
+        walking = self.states == WALK
+        self.velocities[:] = STEPS[self.directions] * self.speed
+        self.velocities[~walking] = 0
+
+        movers = np.flatnonzero(walking)
+        if len(movers):
+            moved = self.positions[movers] + self.velocities[movers] * dt
+            blocked = self.collisions(moved, [actor.rect for actor in actors])
+            self.positions[movers[~blocked]] = moved[~blocked]
+            # Blocked NPCs stay put and turn to one of the other three directions
+            turned = movers[blocked]
+            self.directions[turned] = (self.directions[turned] + self.rng.integers(1, len(STEPS), len(turned))) \
+                % len(STEPS)
+        self.anim_elapsed[walking] += dt
+
+    def hold(self):
+        """Spend a tick frozen, so interpolation stops drawing the last step"""
+        np.copyto(self.previous, self.positions)
+
+    def interpolate(self, alpha):
+        """Set draw_positions alpha of the way from previous to positions"""
+        np.subtract(self.positions, self.previous, out=self.draw_positions)
+        self.draw_positions *= alpha
+        self.draw_positions += self.previous
+
+    def render(self, screen, view):
+        """Draw the NPCs inside view (world pixels) back to front; return the screen rects covered"""
+        x = np.floor(self.draw_positions[:, 0]).astype(np.int32) - view.x
+        y = np.floor(self.draw_positions[:, 1]).astype(np.int32) - view.y
+        visible = np.flatnonzero((x > -CROWD_FRAME_WIDTH) & (x < view.width)
+                                 & (y > -CROWD_FRAME_HEIGHT) & (y < view.height))
+        if not len(visible):
+            return []
+        visible = visible[np.argsort(y[visible], kind="stable")]
+        frame = (self.anim_elapsed[visible] // CROWD_FRAME_MS).astype(np.intp) % CROWD_FRAMES_PER_DIRECTION
+        frames = self.frames
+        return screen.blits([(frames[d][f], (px, py)) for d, f, px, py in
+                             zip(self.directions[visible].tolist(), frame.tolist(),
+                                 x[visible].tolist(), y[visible].tolist())])
+
+    def memory_bytes(self):
+        return sum(array.nbytes for array in (self.positions, self.previous, self.draw_positions, self.velocities,
+                                              self.directions, self.states, self.timers, self.anim_elapsed,
+                                              self.obstacles))
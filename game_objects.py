@@ -1,25 +1,49 @@
 # game_objects.py - Classes for game world and objects
 
+from collections import OrderedDict
 import pygame
+from sprites import surface_bytes
+from config import SPATIAL_CELL_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, TILEMAP_CHUNK_TILES, \
+    TILEMAP_CHUNK_CACHE
 
 
 # Game objects
 class GameObject:
-    def __init__(self, x, y, width, height, sprite=None, name="Object", interaction_text=None):
-        self.x = x
-        self.y = y
-        self.width = width
-        self.height = height
-        self.sprite = sprite
+    """A placed thing in an area. Position and size live only in rect; sprites are shared registry surfaces."""
+    __slots__ = ('rect', 'sprite', 'name', 'interaction_text', 'animation', 'static', 'solid')
+
+    def __init__(self, x, y, width, height, sprite=None, name="Object", interaction_text=None, static=True,
+                 animation=None, solid=True):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.sprite = sprite  # Shared between objects; never drawn on
         self.name = name
         self.interaction_text = interaction_text
-        self.rect = pygame.Rect(x, y, width, height)
+        self.animation = animation  # Optional animation.Animator, replaces sprite
+        self.static = static and animation is None  # Static objects are baked into the area background
+        self.solid = solid  # Blocks movement
 
-    def render(self, screen):
-        if self.sprite:
-            screen.blit(self.sprite, (self.x, self.y))
+    def update(self, dt):
+        if self.animation:
+            self.animation.update(dt)
+
+    def render(self, screen, offset=(0, 0)):
+        """Draw at world position minus offset (the camera's top left)"""
+        x, y = self.rect.x - offset[0], self.rect.y - offset[1]
+        if self.animation:
+            screen.blit(self.animation.frame, (x, y))
+        elif self.sprite:
+            screen.blit(self.sprite, (x, y))
         else:
-            pygame.draw.rect(screen, (200, 200, 200), (self.x, self.y, self.width, self.height))
+            pygame.draw.rect(screen, (200, 200, 200), (x, y, self.rect.width, self.rect.height))
+
+    def get_draw_rect(self, offset=(0, 0)):
+        """Screen area touched by render()"""
+        x, y = self.rect.x - offset[0], self.rect.y - offset[1]
+        if self.animation:
+            return self.animation.frame.get_rect(topleft=(x, y))
+        if self.sprite:
+            return self.sprite.get_rect(topleft=(x, y))
+        return self.rect.move(-offset[0], -offset[1])
 
     def contains_point(self, x, y):
         return self.rect.collidepoint(x, y)
@@ -28,17 +52,303 @@ class GameObject:
         return self.interaction_text
 
 
+class Warp(GameObject):
+    """Invisible trigger that moves the player to spawn in target_area when touched"""
+    __slots__ = ('target_area', 'spawn')
+
+    def __init__(self, x, y, width, height, target_area, spawn, name="Warp"):
+        super().__init__(x, y, width, height, name=name, solid=False)
+        self.target_area = target_area
+        self.spawn = spawn
+
+    def render(self, screen, offset=(0, 0)):
+        pass
+
+    def get_draw_rect(self, offset=(0, 0)):
+        return pygame.Rect(self.rect.x - offset[0], self.rect.y - offset[1], 0, 0)
+
+
+# Spatial index for fast rect queries
+class SpatialGrid:
+    """Uniform grid mapping each cell to the objects whose rects overlap it"""
+
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.object_cells = {}
+
+    def cells_for(self, rect):
+        size = self.cell_size
+        x0, y0 = rect.left // size, rect.top // size
+        x1 = (rect.right - 1) // size if rect.width > 0 else x0
+        y1 = (rect.bottom - 1) // size if rect.height > 0 else y0
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+    def insert(self, obj):
+        cells = self.cells_for(obj.rect)
+        self.object_cells[obj] = cells
+        for cell in cells:
+            self.cells.setdefault(cell, []).append(obj)
+
+    def remove(self, obj):
+        for cell in self.object_cells.pop(obj, ()):
+            bucket = self.cells[cell]
+            bucket.remove(obj)
+            if not bucket:
+                del self.cells[cell]
+
+    def update(self, obj):
+        """Re-index an object after its rect changed"""
+        if self.object_cells.get(obj) != self.cells_for(obj.rect):
+            self.remove(obj)
+            self.insert(obj)
+
+    def query(self, rect):
+        """Return the objects whose rects collide with rect, without duplicates"""
+        found = []
+        seen = set()
+        for cell in self.cells_for(rect):
+            for obj in self.cells.get(cell, ()):
+                if obj not in seen:
+                    seen.add(obj)
+                    if obj.rect.colliderect(rect):
+                        found.append(obj)
+        return found
+
+
 # Define game areas/scenes
 class GameArea:
-    def __init__(self, name, background_color, objects=None):
+    def __init__(self, name, background_color, objects=None, tilemap=None, size=None):
         self.name = name
         self.background_color = background_color
-        self.objects = objects if objects else []
+        self.tilemap = tilemap  # Optional tilemap.TileMap drawn under the objects
+        # World size in pixels; the tilemap decides it when there is one
+        self.size = tilemap.pixel_size if tilemap else (size or (SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.objects = []
+        self.draw_order = {}  # Object -> insertion index, so culled draws keep list order
+        self.next_order = 0
+        self.grid = SpatialGrid()
+        self.moving_grid = SpatialGrid()  # Non-static objects only, for per-frame culling
+        self.objects_version = 0  # Bumped whenever an object is added, removed or moved
+        self.crowd = None  # Optional crowd.Crowd of wandering NPCs, drawn with the moving objects
+        # The static layer (tiles plus static objects) is baked per chunk, so
+        # scrolling composes a few chunks instead of redrawing every object
+        self.chunk_size = tilemap.chunk_tiles * tilemap.tile_size if tilemap else TILEMAP_CHUNK_TILES * TILE_SIZE
+        self.chunks = OrderedDict()
+        if tilemap is not None:
+            tilemap.on_change = self.invalidate_rect
+        self.background = None  # Chunks composed for background_view, rebuilt lazily
+        self.background_view = None
+        self.previous_rects = []  # Screen areas drawn by moving things last frame
+        self.previous_view = None
+        for obj in objects or []:
+            self.add_object(obj)
 
     def add_object(self, obj):
         self.objects.append(obj)
+        self.draw_order[obj] = self.next_order
+        self.next_order += 1
+        self.objects_version += 1
+        self.grid.insert(obj)
+        if obj.static:
+            self.invalidate_rect(obj.get_draw_rect())
+        else:
+            self.moving_grid.insert(obj)
 
-    def render(self, screen):
-        screen.fill(self.background_color)
+    def remove_object(self, obj):
+        self.objects.remove(obj)
+        del self.draw_order[obj]
+        self.objects_version += 1
+        self.grid.remove(obj)
+        if obj.static:
+            self.invalidate_rect(obj.get_draw_rect())
+        else:
+            self.moving_grid.remove(obj)
+
+    def move_object(self, obj, x, y):
+        if obj.static:
+            self.invalidate_rect(obj.get_draw_rect())
+        obj.rect.topleft = (x, y)
+        self.objects_version += 1
+        self.grid.update(obj)
+        if obj.static:
+            self.invalidate_rect(obj.get_draw_rect())
+        else:
+            self.moving_grid.update(obj)
+
+    def update(self, dt, actors=()):
+        """Advance animated objects and the crowd by dt milliseconds; the crowd walks around actors"""
         for obj in self.objects:
-            obj.render(screen)
\ No newline at end of file
+            if obj.animation:
+                obj.update(dt)
+        if self.crowd is not None:
+            self.crowd.update(dt, actors)
+
+    def hold(self):
+        """Spend a tick frozen: moving things are drawn where they are, not between updates"""
+        if self.crowd is not None:
+            self.crowd.hold()
+
+    def interpolate(self, alpha):
+        """Place moving things alpha of the way between the last two updates for drawing"""
+        if self.crowd is not None:
+            self.crowd.interpolate(alpha)
+
+    @property
+    def animating(self):
+        """True if anything in the area moves or animates on its own"""
+        return bool(self.moving_grid.object_cells) or (self.crowd is not None and len(self.crowd) > 0)
+
+    def query_rect(self, rect):
+        return self.grid.query(rect)
+
+    def is_blocked(self, rect):
+        """Return True if rect hits a solid tile or any object"""
+        if self.tilemap is not None and self.tilemap.blocked(rect):
+            return True
+        return any(obj.solid for obj in self.grid.query(rect))
+
+    def find_warp(self, rect):
+        for obj in self.grid.query(rect):
+            if isinstance(obj, Warp):
+                return obj
+        return None
+
+    def find_interactable(self, rect, origin):
+        """Return the object with interaction text inside rect that is closest to origin"""
+        nearest = None
+        nearest_distance = None
+        for obj in self.grid.query(rect):
+            if obj.interaction_text is None:
+                continue
+            dx = obj.rect.centerx - origin[0]
+            dy = obj.rect.centery - origin[1]
+            distance = dx * dx + dy * dy
+            if nearest is None or distance < nearest_distance:
+                nearest, nearest_distance = obj, distance
+        return nearest
+
+    def invalidate_background(self):
+        """Rebake everything on the next draw"""
+        self.chunks.clear()
+        self.background_view = None
+
+    def invalidate_rect(self, rect):
+        """Rebake only the chunks overlapping rect (world pixels)"""
+        for key in self.chunk_keys(rect):
+            self.chunks.pop(key, None)
+        self.background_view = None
+
+    def visible_objects(self, view, grid=None):
+        """Objects overlapping view, in the order they were added"""
+        return sorted((grid or self.grid).query(view), key=self.draw_order.__getitem__)
+
+    def chunk_keys(self, rect):
+        rect = pygame.Rect(rect).clip(pygame.Rect((0, 0), self.size))
+        if not rect.width or not rect.height:
+            return []
+        span = self.chunk_size
+        return [(cx, cy)
+                for cy in range(rect.top // span, (rect.bottom - 1) // span + 1)
+                for cx in range(rect.left // span, (rect.right - 1) // span + 1)]
+
+    def chunk_rect(self, cx, cy):
+        span = self.chunk_size
+        return pygame.Rect(cx * span, cy * span, span, span).clip(pygame.Rect((0, 0), self.size))
+
+    def build_chunk(self, cx, cy):
+        rect = self.chunk_rect(cx, cy)
+        chunk = pygame.Surface(rect.size)
+        chunk.fill(self.background_color)
+        if self.tilemap is not None:
+            chunk.blit(self.tilemap.build_chunk(cx, cy), (0, 0))
+        # Sprites can overhang their rects, so look a cell past the chunk edge
+        margin = SPATIAL_CELL_SIZE
+        for obj in self.visible_objects(rect.inflate(2 * margin, 2 * margin)):
+            if obj.static:
+                obj.render(chunk, rect.topleft)
+        return chunk
+
+    def get_chunk(self, cx, cy):
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = self.build_chunk(cx, cy)
+            while len(self.chunks) > TILEMAP_CHUNK_CACHE:
+                self.chunks.popitem(last=False)
+        else:
+            self.chunks.move_to_end(key)
+        return chunk
+
+    def memory_bytes(self):
+        """Rough resident size: baked surfaces, tile grids and object sprites"""
+        surfaces = list(self.chunks.values())
+        if self.background is not None:
+            surfaces.append(self.background)
+        # Sprites are shared, so each distinct one counts once
+        sprites = {id(obj.sprite): obj.sprite for obj in self.objects if obj.sprite is not None}
+        surfaces.extend(sprites.values())
+        total = sum(surface_bytes(surface) for surface in surfaces)
+        if self.tilemap is not None:
+            total += self.tilemap.grid_bytes()
+        if self.crowd is not None:
+            total += self.crowd.memory_bytes()
+        return total
+
+    def get_background(self, size, view=None):
+        """Return the static layer seen through view (world pixels), composed from baked chunks"""
+        view = pygame.Rect(view or ((0, 0), size))
+        if (self.background is None or self.background.get_size() != size
+                or self.background_view != view.topleft):
+            if self.background is None or self.background.get_size() != size:
+                self.background = pygame.Surface(size)
+            self.background.fill(self.background_color)
+            self.background_view = view.topleft
+            for cx, cy in self.chunk_keys(view):
+                rect = self.chunk_rect(cx, cy)
+                self.background.blit(self.get_chunk(cx, cy), (rect.x - view.x, rect.y - view.y))
+        return self.background
+
+    def render_moving(self, screen, actors, view):
+        """Draw visible non-static objects and actors, returning the screen rects they cover"""
+        rects = []
+        offset = view.topleft
+        for obj in self.visible_objects(view, self.moving_grid):
+            obj.render(screen, offset)
+            rects.append(obj.get_draw_rect(offset))
+        if self.crowd is not None:
+            rects.extend(self.crowd.render(screen, view))
+        for actor in actors:
+            if view.colliderect(actor.draw_rect):
+                actor.render(screen, offset)
+                rects.append(actor.get_draw_rect(offset))
+        return rects
+
+    @staticmethod
+    def get_view(screen, camera):
+        return camera.rect if camera is not None else screen.get_rect()
+
+    def render(self, screen, actors=(), camera=None):
+        view = self.get_view(screen, camera)
+        screen.blit(self.get_background(screen.get_size(), view), (0, 0))
+        self.previous_rects = self.render_moving(screen, actors, view)
+        self.previous_view = view.topleft
+
+    def render_dirty(self, screen, actors=(), camera=None):
+        """Redraw only what moved since the last frame and return the dirty rects.
+
+        Requires the previous frame to have been drawn by render() or
+        render_dirty() onto the same surface. When the camera scrolled or the
+        static layer changed, the whole frame is redrawn and returned as one rect.
+        """
+        view = self.get_view(screen, camera)
+        if view.topleft != self.previous_view or view.topleft != self.background_view:
+            self.render(screen, actors, camera)
+            return [screen.get_rect()]
+        background = self.get_background(screen.get_size(), view)
+        for rect in self.previous_rects:
+            screen.blit(background, rect, rect)
+        current_rects = self.render_moving(screen, actors, view)
+        dirty_rects = self.previous_rects + current_rects
+        self.previous_rects = current_rects
+        return dirty_rects
@@ -1,59 +1,110 @@
 # game_world.py - Creates and manages the game world
 
-from config import SCREEN_WIDTH, SCREEN_HEIGHT, GREEN
-from game_objects import GameArea, GameObject
-from sprites import get_chest_sprite, get_bush_sprite, get_rock_sprite, get_npc_sprite, get_house_sprite
-import random
+import logging
+import time
+import zlib
+from collections import OrderedDict
+from config import AREA_MEMORY_BUDGET
+from animation import Animator
+from crowd import Crowd
+from game_objects import GameArea, GameObject, Warp
+from sprites import get_sprite, get_npc_sprite, get_sequence_clip, release_regions, sprite_registry, SPRITE_REGIONS
+from tilemap import TileMap, release_tiles
+from world_loader import load_world_definition
+
+logger = logging.getLogger(__name__)
+
+
+def build_area(name, area):
+    """Create a GameArea from its compiled definition (see world_loader.py)"""
+    tilemap = TileMap.from_compiled(area["width"], area["height"], area["layers"], area["solid"],
+                                    area["background"])
+    game_area = GameArea(name, area["background"], tilemap=tilemap)
+    for obj_name, x, y, width, height, sprite, npc, animation, text, warp, spawn in area["objects"]:
+        if warp is not None:
+            game_area.add_object(Warp(x, y, width, height, warp, spawn, obj_name))
+        elif animation is not None:
+            clip = get_sequence_clip(animation)
+            game_area.add_object(GameObject(x, y, width, height, clip.frames[0], obj_name, text,
+                                            animation=Animator({animation: clip}, animation)))
+        else:
+            image = get_npc_sprite(npc) if npc >= 0 else get_sprite(sprite)
+            game_area.add_object(GameObject(x, y, width, height, image, obj_name, text))
+    if area["crowd"]:
+        # Seeded by name so an area's crowd wanders the same way every time it loads
+        game_area.crowd = Crowd(game_area, area["crowd"], seed=zlib.crc32(name.encode()))
+    return game_area
 
 
 # Create game world
-def create_game_world():
-    main_area = GameArea("Main Area", GREEN)
-
-    # Add bushes and rocks around the edges for borders
-    for i in range(0, SCREEN_WIDTH, 32):
-        bush_top = GameObject(i, 0, 16, 16, get_bush_sprite(), "Bush")
-        bush_bottom = GameObject(i, SCREEN_HEIGHT - 16, 16, 16, get_bush_sprite(), "Bush")
-        main_area.add_object(bush_top)
-        main_area.add_object(bush_bottom)
-    for i in range(0, SCREEN_HEIGHT, 32):
-        bush_left = GameObject(0, i, 16, 16, get_bush_sprite(), "Bush")
-        bush_right = GameObject(SCREEN_WIDTH - 16, i, 16, 16, get_bush_sprite(), "Bush")
-        main_area.add_object(bush_left)
-        main_area.add_object(bush_right)
-
-    # Add some rocks for variety
-    for i in range(3):
-        rock1 = GameObject(100 + i * 200, 100, 16, 16, get_rock_sprite(), "Rock")
-        rock2 = GameObject(100 + i * 200, SCREEN_HEIGHT - 120, 16, 16, get_rock_sprite(), "Rock")
-        main_area.add_object(rock1)
-        main_area.add_object(rock2)
-
-    # Add chests for About Me and Contact
-    about_chest = GameObject(150, 300, 16, 16, get_chest_sprite(), "About Me Chest", "A treasure chest containing personal information.")
-    main_area.add_object(about_chest)
-    contact_chest = GameObject(450, 400, 16, 16, get_chest_sprite(), "Contact Information", "How to get in touch.")
-    main_area.add_object(contact_chest)
-
-    # Add NPCs using get_npc_sprite (random non-naked characters)
-    used_indices = set()
-    def get_unique_npc_index():
-        idx = random.randint(0, 7)
-        while idx in used_indices:
-            idx = random.randint(0, 7)
-        used_indices.add(idx)
-        return idx
-    skills_npc = GameObject(200, 200, 24, 32, get_npc_sprite(get_unique_npc_index()), "Skills Master", "I've heard you have impressive skills. Let me see them!")
-    main_area.add_object(skills_npc)
-    experience_npc = GameObject(400, 150, 24, 32, get_npc_sprite(get_unique_npc_index()), "Experience Sage", "Your work history tells an interesting story!")
-    main_area.add_object(experience_npc)
-    education_npc = GameObject(300, 350, 24, 32, get_npc_sprite(get_unique_npc_index()), "Knowledge Keeper", "Education is the foundation of growth.")
-    main_area.add_object(education_npc)
-    projects_npc = GameObject(500, 300, 24, 32, get_npc_sprite(get_unique_npc_index()), "Project Master", "Show me what you've built!")
-    main_area.add_object(projects_npc)
-
-    # House using the house sprite from Overworld.png
-    house = GameObject(SCREEN_WIDTH - 200, 80, 48, 48, get_house_sprite(), "House", "Your home, where you've developed many of your projects.")
-    main_area.add_object(house)
-
-    return main_area
\ No newline at end of file
+def create_game_world(definition=None):
+    """Build the start area on its own"""
+    definition = definition or load_world_definition()
+    start = definition["start_area"]
+    return build_area(start, definition["areas"][start])
+
+
+def get_startup_regions(definition):
+    """Every region except those only needed by areas the player has not entered yet"""
+    start = definition["start_area"]
+    later = set()
+    for name, area in definition["areas"].items():
+        if name != start:
+            later.update(area["regions"])
+    later -= set(definition["areas"][start]["regions"])
+    return [name for name in SPRITE_REGIONS if name not in later]
+
+
+class World:
+    """Builds areas on first entry and unloads the least recently used ones over budget"""
+
+    def __init__(self, definition=None, memory_budget=AREA_MEMORY_BUDGET):
+        definition = definition or load_world_definition()
+        self.areas = definition["areas"]
+        self.start_area = definition["start_area"]
+        self.memory_budget = memory_budget
+        self.loaded = OrderedDict()  # Area name -> GameArea, least recently entered first
+        self.current = None
+
+    def get_area(self, name):
+        area = self.loaded.get(name)
+        if area is None:
+            start = time.perf_counter()
+            area = self.loaded[name] = build_area(name, self.areas[name])
+            logger.info(f"Loaded area {name} in {(time.perf_counter() - start) * 1000:.1f} ms")
+        self.loaded.move_to_end(name)
+        return area
+
+    def enter(self, name):
+        self.current = self.get_area(name)
+        self.evict()
+        return self.current
+
+    def memory_bytes(self):
+        return sum(area.memory_bytes() for area in self.loaded.values())
+
+    def evict(self):
+        """Unload areas, oldest first, until under budget; the current area always stays"""
+        while self.memory_bytes() > self.memory_budget and len(self.loaded) > 1:
+            name = next(iter(self.loaded))
+            if self.loaded[name] is self.current:
+                break
+            self.unload(name)
+
+    def unload(self, name):
+        del self.loaded[name]
+        still_needed = set()
+        for other in self.loaded:
+            still_needed.update(self.areas[other]["regions"])
+        unused = [region for region in self.areas[name]["regions"] if region not in still_needed]
+        release_tiles(unused)
+        release_regions(unused)
+        logger.info(f"Unloaded area {name}")
+
+    def stats(self):
+        return {
+            "loaded": list(self.loaded),
+            "bytes": self.memory_bytes(),
+            "budget": self.memory_budget,
+            "sprites": sprite_registry.stats(),
+        }
\ No newline at end of file
@@ -0,0 +1,53 @@
+# loader.py - Asynchronous, progressive asset loading
+
+import asyncio
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+from config import LOADER_THREADS
+from sprites import store_source_image
+
+logger = logging.getLogger(__name__)
+
+# pygbag runs on emscripten, where there are no threads to hand work to
+IS_BROWSER = sys.platform == "emscripten"
+
+
+class AssetLoader:
+    """Runs blocking load jobs without stalling the frame loop.
+
+    On desktop jobs go to a thread pool; in the browser they run inline and
+    yield to the event loop after each one so the page keeps rendering.
+    """
+
+    def __init__(self, max_workers=LOADER_THREADS):
+        self.executor = None if IS_BROWSER else ThreadPoolExecutor(max_workers=max_workers)
+        self.total = 0
+        self.done = 0
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 1.0
+
+    async def run_blocking(self, func, *args):
+        if self.executor is None:
+            result = func(*args)
+            await asyncio.sleep(0)
+            return result
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def load_image(self, path):
+        # Decoding is off-thread; conversion needs the display, so it stays on this thread
+        image = await self.run_blocking(pygame.image.load, path)
+        store_source_image(path, image)
+        self.done += 1
+
+    async def load_images(self, paths):
+        self.total += len(paths)
+        await asyncio.gather(*(self.load_image(path) for path in paths))
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
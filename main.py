@@ -4,64 +4,166 @@ import pygame
 import asyncio
 import sys
 import logging
+import argparse
+import random
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Import game modules
+import config
 from config import *
 from player import Player
-from game_world import create_game_world
-from ui_systems import DialogSystem, MenuSystem, ResumeDisplay
+from game_world import World, get_startup_regions
+from world_loader import load_world_definition
+from ui_systems import DialogSystem, MenuSystem, ResumeDisplay, ScreenFade, UICompositor, render_loading_screen
+from loader import AssetLoader, IS_BROWSER
+from sprites import get_preload_paths
+from presenter import Presenter
+from camera import Camera
+from scheduler import FixedTimestep, create_scheduler
+from profiler import frame_profiler
+from replay import InputRecorder, InputReplay, ReplayKeys, keys_to_mask
 from resume_data import RESUME_DATA
+from resume_loader import ResumeWatcher, SECTIONS as RESUME_SECTIONS
 
 # Game state variables
 game_running = True
 in_main_menu = True
 screen = None
-clock = None
+scheduler = None
+timestep = None
 player = None
 game_world = None
 dialog_system = None
 menu_system = None
 resume_display = None
+resume_watcher = None
+ui_compositor = None
 GAME_SURFACE = None
+presenter = None
 IS_FULLSCREEN = False
+needs_full_redraw = True
+input_recorder = None
+input_recorder_path = None
+input_replay = None
+input_replay_idle_keys = ReplayKeys(0)
+replay_realtime = False
+frame_stats_path = FRAME_STATS_EXPORT_PATH
+asset_loader = None
+world_task = None
+world_error = None  # Why the world failed to load, shown instead of the loading bar
+world_done_seen = False
+camera = None
+world = None
+screen_fade = None
+
+
+def initialize_display():
+    """Start pygame and create the window and render targets"""
+    global screen, scheduler, timestep, GAME_SURFACE, presenter
+    if not pygame.get_init():
+        pygame.init()
+
+    # Screen setup
+    screen = pygame.display.set_mode((SCREEN_WIDTH * WINDOW_SCALE, SCREEN_HEIGHT * WINDOW_SCALE))
+    pygame.display.set_caption("Interactive Resume - SNES Style")
+
+    # Frame pacing and fixed simulation ticks; fast replays skip the frame cap
+    scheduler = create_scheduler(throttle=not input_replay or replay_realtime)
+    timestep = FixedTimestep()
+
+    GAME_SURFACE = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    presenter = Presenter(GAME_SURFACE.get_size())
+
+
+def initialize_ui():
+    """Create fonts and the UI systems the main menu needs"""
+    global dialog_system, menu_system, resume_display, resume_watcher, screen_fade, ui_compositor
+
+    # Initialize fonts and test
+    success = initialize_fonts()
+    if not success:
+        raise RuntimeError("Font initialization failed")
+
+    dialog_system = DialogSystem()
+    menu_system = MenuSystem()
+    resume_display = ResumeDisplay()
+    screen_fade = ScreenFade()
+    ui_compositor = UICompositor(dialog_system, menu_system, resume_display, screen_fade)
+    # Edits to the resume files show up while the game runs; the browser build ships them read-only
+    if RESUME_HOT_RELOAD and not IS_BROWSER:
+        resume_watcher = ResumeWatcher(RESUME_DATA)
+
+
+def initialize_world(definition=None):
+    """Create the player and the game world (needs the sprite images)"""
+    global player, game_world, camera, world
+    player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    world = World(definition)
+    game_world = world.enter(world.start_area)
+    camera = Camera((SCREEN_WIDTH, SCREEN_HEIGHT))
+    camera.follow(player.draw_rect, game_world.size)
 
 
 def initialize_game():
     """Initialize game systems and create game objects"""
-    global screen, clock, player, game_world, dialog_system, menu_system, resume_display, GAME_SURFACE
-
     try:
         # Initialize Pygame
         logger.info("Starting game initialization...")
-        if not pygame.get_init():
-            pygame.init()
+        initialize_display()
+        initialize_ui()
+        initialize_world()
 
-        # Initialize fonts and test
-        success = initialize_fonts()
-        if not success:
-            raise RuntimeError("Font initialization failed")
+        logger.info("Game initialization completed successfully")
+        return True
 
-        # Screen setup
-        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Interactive Resume - SNES Style")
+    except Exception as e:
+        logger.error(f"Error during initialization: {str(e)}")
+        return False
 
-        # Game clock
-        clock = pygame.time.Clock()
 
-        # Create game objects
-        player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-        game_world = create_game_world()
-        dialog_system = DialogSystem()
-        menu_system = MenuSystem()
-        resume_display = ResumeDisplay()
+def present_loading_screen(progress):
+    render_loading_screen(GAME_SURFACE, progress)
+    presenter.present(screen, GAME_SURFACE)
+    pygame.display.flip()
 
-        GAME_SURFACE = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
 
-        logger.info("Game initialization completed successfully")
+async def load_world():
+    """Decode world images in the background, then build the world"""
+    try:
+        definition = await asset_loader.run_blocking(load_world_definition)
+        # Other areas load their images on first entry
+        await asset_loader.load_images(get_preload_paths(get_startup_regions(definition)))
+        initialize_world(definition)
+        logger.info("World assets loaded")
+    except Exception as e:
+        logger.error(f"Error loading the world: {str(e)}")
+        raise
+    finally:
+        asset_loader.shutdown()
+
+
+async def load_game():
+    """Show a loading screen, bring up the menu as soon as its fonts are ready,
+    and keep loading world assets behind it"""
+    global asset_loader, world_task
+    try:
+        logger.info("Starting progressive game initialization...")
+        initialize_display()
+        present_loading_screen(0.0)
+
+        asset_loader = AssetLoader()
+        # Font discovery can enumerate system fonts; keep it off the frame loop
+        await asset_loader.run_blocking(resolve_font_path)
+        initialize_ui()
+        present_loading_screen(0.5)
+
+        world_task = asyncio.ensure_future(load_world())
+        if input_recorder or input_replay:
+            # Replays must see the world on the same frame the recording did
+            await world_task
         return True
 
     except Exception as e:
@@ -69,6 +171,88 @@ def initialize_game():
         return False
 
 
+def check_world_task():
+    """Return True once, on the first frame after the world task finished, failed or not.
+
+    Overlays opened during loading (the Welcome dialog) sit behind the
+    loading screen, so that frame must be drawn even though nothing animates.
+    """
+    global world_error, world_done_seen
+    if world_done_seen or world_task is None or not world_task.done():
+        return False
+    world_done_seen = True
+    if not world_task.cancelled():
+        world_error = world_task.exception()
+    return True
+
+
+def world_ready():
+    return game_world is not None and player is not None
+
+
+def simulate(keys, dt):
+    """Run one fixed simulation tick of dt milliseconds"""
+    dialog_system.update(dt)
+    screen_fade.update(dt)
+    if not (dialog_system.active or menu_system.active or resume_display.active or
+            screen_fade.active or in_main_menu) and world_ready():
+        update_world(keys, dt)
+    elif world_ready():
+        # Frozen under an overlay: without this, interpolation keeps sliding between the last two ticks
+        hold_world()
+
+
+def update_world(keys, dt):
+    """Advance the player and the world by dt milliseconds"""
+    player.update(keys, game_world, dt)
+    game_world.update(dt, (player,))
+    warp = game_world.find_warp(player.rect)
+    if warp and not screen_fade.active:
+        screen_fade.start(lambda: enter_area(warp.target_area, warp.spawn))
+
+
+def hold_world():
+    player.hold()
+    game_world.hold()
+
+
+def screen_animating(keys):
+    """True while the picture can change without new input (held movement keys count)"""
+    if input_replay or frame_profiler.hud_visible or ui_compositor.animating:
+        return True
+    if world_task is not None and not world_task.done():
+        return True  # Loading progress, or the world about to appear
+    if in_main_menu or ui_compositor.active or not world_ready():
+        return False  # The world is frozen under the title screen and overlays
+    return (game_world.animating or player.draw_rect.topleft != player.rect.topleft
+            or keys_to_mask(keys) != 0)
+
+
+def interpolate_world(alpha):
+    """Position what gets drawn, and the camera, alpha of the way through the current tick"""
+    player.interpolate(alpha)
+    game_world.interpolate(alpha)
+    camera.follow(player.draw_rect, game_world.size)
+
+
+def enter_area(name, spawn):
+    """Switch the current area and place the player at spawn"""
+    global game_world, needs_full_redraw
+    game_world = world.enter(name)
+    player.place(*spawn)
+    camera.follow(player.draw_rect, game_world.size)
+    needs_full_redraw = True
+
+
+def reload_resume():
+    """Reload edited resume files and refresh their sections; return True if any changed"""
+    reloaded = resume_watcher.poll(pygame.time.get_ticks())
+    for name in reloaded:
+        section = RESUME_SECTIONS[name]
+        resume_display.refresh(section.page, RESUME_DATA[section.key] if section.key else None)
+    return bool(reloaded)
+
+
 def handle_object_interaction(obj):
     """Handle interactions with game objects"""
     try:
@@ -143,93 +327,238 @@ async def handle_keydown_event(event):
             handle_menu_navigation(event)
         elif resume_display.active and event.key == pygame.K_ESCAPE:
             resume_display.close()
-        elif not in_main_menu and (event.key == pygame.K_e or event.key == pygame.K_SPACE):
-            interaction_target = player.get_interaction_target(game_world.objects)
+        elif resume_display.active and resume_display.handle_key(event.key):
+            pass  # Scrolled the section; other keys fall through to the global ones below
+        elif not in_main_menu and world_ready() and (event.key == pygame.K_e or event.key == pygame.K_SPACE):
+            interaction_target = player.get_interaction_target(game_world)
             if interaction_target:
                 handle_object_interaction(interaction_target)
         elif not in_main_menu and event.key == pygame.K_ESCAPE:
             menu_system.show_menu("Paused", ["Resume", "Controls", "Exit"], handle_menu_selection)
         elif event.key == pygame.K_F11:
             toggle_fullscreen()
+        elif event.key == pygame.K_F3:
+            toggle_frame_hud()
     except Exception as e:
         logger.error(f"Error handling keydown event: {str(e)}")
 
 
 def render_game():
-    """Handle game rendering"""
+    """Handle game rendering.
+
+    Returns the list of dirty rects to present, or None when the whole
+    screen was redrawn and should be flipped.
+    """
+    global needs_full_redraw
     try:
         target_surface = GAME_SURFACE if GAME_SURFACE is not None else screen
+        overlay_active = in_main_menu or ui_compositor.active
+
+        if not in_main_menu and not world_ready():
+            # Started before the world finished loading, or it never will
+            if world_error is not None:
+                render_loading_screen(target_surface, 0.0, "Could not load the world", str(world_error))
+            else:
+                render_loading_screen(target_surface, asset_loader.progress if asset_loader else 1.0)
+            needs_full_redraw = True
+            if target_surface is not screen:
+                presenter.present(screen, target_surface)
+            return None
+
+        if DIRTY_RECT_RENDERING and not overlay_active and not needs_full_redraw:
+            dirty_rects = game_world.render_dirty(target_surface, [player], camera)
+            if target_surface is screen:
+                return dirty_rects
+            with frame_profiler.phase("scale"):
+                window_rects = presenter.present_rects(screen, target_surface, dirty_rects)
+            if window_rects is not None:
+                return window_rects
+
         if not in_main_menu:
-            game_world.render(target_surface)
-            player.render(target_surface)
+            game_world.render(target_surface, [player], camera)
         else:
             target_surface.fill(BLUE)
-            title_text = create_pixel_text("Interactive Resume Game", large_font, YELLOW)
+            title_text = create_pixel_text("Interactive Resume Game", config.large_font, YELLOW)
             target_surface.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 100))
 
-            subtitle_text = create_pixel_text(f"By {RESUME_DATA['PLAYER_NAME']}", medium_font, WHITE)
+            subtitle_text = create_pixel_text(f"By {RESUME_DATA['PLAYER_NAME']}", config.medium_font, WHITE)
             target_surface.blit(subtitle_text, (SCREEN_WIDTH // 2 - subtitle_text.get_width() // 2, 150))
 
-        dialog_system.render(target_surface)
-        menu_system.render(target_surface)
-        resume_display.render(target_surface)
+        ui_compositor.render(target_surface)
+        # Overlays leave pixels behind, so only an overlay-free frame can seed dirty rendering
+        needs_full_redraw = overlay_active
+
         # Scale to window
-        window_size = screen.get_size()
-        scaled_surface = pygame.transform.scale(target_surface, window_size)
-        screen.blit(scaled_surface, (0, 0))
+        if target_surface is not screen:
+            with frame_profiler.phase("scale"):
+                presenter.present(screen, target_surface)
 
     except Exception as e:
         logger.error(f"Error in render_game: {str(e)}")
+        needs_full_redraw = True
+    return None
 
 
 def toggle_fullscreen():
-    global screen, IS_FULLSCREEN
+    global screen, IS_FULLSCREEN, needs_full_redraw
     IS_FULLSCREEN = not IS_FULLSCREEN
+    needs_full_redraw = True
     if IS_FULLSCREEN:
         screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
     else:
-        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        screen = pygame.display.set_mode((SCREEN_WIDTH * WINDOW_SCALE, SCREEN_HEIGHT * WINDOW_SCALE))
+
+
+def toggle_frame_hud():
+    global needs_full_redraw
+    frame_profiler.toggle_hud()
+    needs_full_redraw = True
+
+
+def handle_mouse_wheel(notches):
+    """Scroll the open resume list; positive notches scroll up"""
+    if resume_display.active:
+        resume_display.scroll_by(-notches * RESUME_SCROLL_STEP)
+
+
+def read_replay_frame():
+    """Return (recorded dt, keys, keydown codes, wheel notches) for the next replayed frame, stopping at the end"""
+    global game_running
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            game_running = False
+    frame = input_replay.next_frame()
+    if frame is None:
+        game_running = False
+        return 0, input_replay_idle_keys, [], 0
+    return frame
 
 
 async def main():
     """Main game loop"""
     global game_running, in_main_menu
 
+    if menu_system is None and not await load_game():
+        pygame.quit()
+        return 1
+
     try:
         # Show initial menu
         menu_system.show_menu("Interactive Resume", ["Start Game", "About", "Exit"], handle_menu_selection)
 
+        dt = 0  # Real milliseconds since the previous frame
+        redraw_pending = True
+        woken_events = []  # Taken off the queue by scheduler.idle, handled ahead of newer ones
         while game_running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    game_running = False
-                elif event.type == pygame.KEYDOWN:
-                    await handle_keydown_event(event)
-
-            if not (dialog_system.active or menu_system.active or
-                    resume_display.active or in_main_menu):
-                keys = pygame.key.get_pressed()
-                player.update(keys, game_world.objects)
-
-            render_game()
-            pygame.display.flip()
-            clock.tick(FPS)
-            await asyncio.sleep(0)  # Required for browser deployment
+            frame_profiler.begin_frame()
+            with frame_profiler.phase("events"):
+                if input_replay:
+                    # Recorded frame times feed the same fixed ticks the recording ran
+                    dt, keys, events, wheel = read_replay_frame()
+                    for key in events:
+                        await handle_keydown_event(pygame.event.Event(pygame.KEYDOWN, key=key))
+                    if wheel:
+                        handle_mouse_wheel(wheel)
+                else:
+                    events = woken_events + pygame.event.get()
+                    woken_events = []
+                    for event in events:
+                        if event.type == pygame.QUIT:
+                            game_running = False
+                        elif event.type == pygame.KEYDOWN:
+                            if input_recorder:
+                                input_recorder.record_keydown(event.key)
+                            await handle_keydown_event(event)
+                        elif event.type == pygame.MOUSEWHEEL:
+                            if input_recorder:
+                                input_recorder.record_wheel(event.y)
+                            handle_mouse_wheel(event.y)
+                    keys = pygame.key.get_pressed()
+                    if input_recorder:
+                        input_recorder.end_frame(dt, keys)
+                if resume_watcher and reload_resume():
+                    redraw_pending = True
+                if check_world_task():
+                    redraw_pending = True
+
+            # Anything changing this frame was either animating already or caused by input
+            changed = redraw_pending or bool(events) or screen_animating(keys)
+            redraw_pending = False
+
+            with frame_profiler.phase("update"):
+                for _ in range(timestep.advance(dt)):
+                    simulate(keys, TICK_MS)
+                if world_ready():
+                    interpolate_world(timestep.alpha)
+
+            if not changed:
+                # The last frame is still accurate: wait for input instead of redrawing it
+                woken_events = await scheduler.idle(IDLE_HEARTBEAT_MS)
+                dt = 0
+                continue
+
+            with frame_profiler.phase("render"):
+                dirty_rects = render_game()
+                if frame_profiler.hud_visible:
+                    hud_rect = frame_profiler.render_hud(screen)
+                    if dirty_rects is not None:
+                        dirty_rects.append(hud_rect)
+
+            with frame_profiler.phase("present"):
+                if dirty_rects is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(dirty_rects)
+
+            # The scheduler times its own "tick" and "yield" phases
+            elapsed = await scheduler.next_frame()
+            if not input_replay:
+                dt = elapsed
+            frame_profiler.end_frame()
 
     except Exception as e:
         logger.error(f"Error in main game loop: {str(e)}")
     finally:
+        if input_recorder and input_recorder_path:
+            input_recorder.save(input_recorder_path)
+        if frame_stats_path:
+            frame_profiler.export(frame_stats_path)
         pygame.quit()
         return 0
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Interactive Resume - SNES Style")
+    parser.add_argument("--record", metavar="PATH", help="record input to a replay file")
+    parser.add_argument("--replay", metavar="PATH", help="play back a recorded replay file")
+    parser.add_argument("--realtime", action="store_true", help="replay at normal speed instead of as fast as possible")
+    parser.add_argument("--frame-stats", metavar="PATH", default=FRAME_STATS_EXPORT_PATH,
+                        help="write frame timing stats to PATH (.json or .csv) on exit")
+    return parser.parse_known_args(argv)[0]
+
+
+def setup_input_mode(args):
+    """Seed the world and create the recorder or replay before the game is built"""
+    global input_recorder, input_recorder_path, input_replay, replay_realtime
+    if args.replay:
+        input_replay = InputReplay(args.replay)
+        replay_realtime = args.realtime
+        random.seed(input_replay.seed)
+    elif args.record:
+        seed = random.randrange(2 ** 32)
+        random.seed(seed)
+        input_recorder = InputRecorder(seed)
+        input_recorder_path = args.record
+
+
 if __name__ == "__main__":
     try:
-        if initialize_game():
-            asyncio.run(main())
-        else:
+        args = parse_args()
+        setup_input_mode(args)
+        frame_stats_path = args.frame_stats
+        if asyncio.run(main()) != 0:
             logger.error("Game initialization failed")
             sys.exit(1)
     except Exception as e:
         logger.error(f"Fatal error: {str(e)}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
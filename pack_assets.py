@@ -0,0 +1,123 @@
+# pack_assets.py - Packs every sprite region the game uses into one atlas
+#
+# Usage:
+#   python pack_assets.py                    # write static/atlas.png and static/atlas.json
+#   python pack_assets.py --web-dir build/web_src
+#       also stage a folder for pygbag holding only the game modules and the atlas:
+#       python -m pygbag build/web_src
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import glob
+import json
+import logging
+import shutil
+import sys
+
+import pygame
+from config import WORLD_DATA_PATH, WORLD_CACHE_PATH, RESUME_DATA_DIR
+from sprites import SPRITE_REGIONS, ATLAS_IMAGE, ATLAS_INDEX, atlas_sources_digest
+from world_loader import load_world_definition
+
+logger = logging.getLogger(__name__)
+
+ATLAS_WIDTH = 512
+PADDING = 1  # Transparent gap between regions so filtering never bleeds
+TOOL_MODULES = {"pack_assets.py", "benchmark.py"}
+
+
+def load_regions():
+    """Cut every region out of its source image, trimming transparent borders where allowed"""
+    images = {}
+    regions = []
+    for name, (path, rect, trim) in SPRITE_REGIONS.items():
+        if path not in images:
+            images[path] = pygame.image.load(path)
+        image = images[path]
+        rect = pygame.Rect(rect).clip(image.get_rect()) if rect else image.get_rect()
+        surface = image.subsurface(rect)
+        offset = (0, 0)
+        if trim:
+            bounds = surface.get_bounding_rect()
+            if bounds.width and bounds.height:
+                offset = bounds.topleft
+                surface = surface.subsurface(bounds)
+        regions.append((name, surface, rect.size, offset))
+    return regions
+
+
+def shelf_pack(regions, width=ATLAS_WIDTH):
+    """Place regions on shelves, tallest first; returns {name: Rect} and the atlas height"""
+    placements = {}
+    x = y = shelf_height = 0
+    for name, surface, _, _ in sorted(regions, key=lambda r: (-r[1].get_height(), r[0])):
+        w, h = surface.get_size()
+        if w > width:
+            raise ValueError(f"Region {name} ({w}px) is wider than the atlas ({width}px)")
+        if x + w > width:
+            x, y = 0, y + shelf_height + PADDING
+            shelf_height = 0
+        placements[name] = pygame.Rect(x, y, w, h)
+        x += w + PADDING
+        shelf_height = max(shelf_height, h)
+    return placements, y + shelf_height
+
+
+def build_atlas(image_path=ATLAS_IMAGE, index_path=ATLAS_INDEX):
+    regions = load_regions()
+    placements, height = shelf_pack(regions)
+    atlas = pygame.Surface((ATLAS_WIDTH, max(height, 1)), pygame.SRCALPHA)
+    index = {}
+    for name, surface, size, offset in regions:
+        rect = placements[name]
+        atlas.blit(surface, rect)
+        index[name] = {"rect": list(rect), "size": list(size), "offset": list(offset)}
+
+    pygame.image.save(atlas, image_path)
+    with open(index_path, "w") as f:
+        # The game falls back to the source images once this no longer matches them
+        json.dump({"image": os.path.basename(image_path), "sources": atlas_sources_digest(), "sprites": index}, f,
+                  indent=1, sort_keys=True)
+    logger.info(f"Packed {len(index)} regions into {image_path} ({ATLAS_WIDTH}x{height})")
+    return atlas, index
+
+
+def stage_web_build(web_dir):
+    """Copy the game modules, world file, resume files and packed atlas only, leaving raw sheets, .xcf, .gif and .zip out"""
+    if os.path.exists(web_dir):
+        shutil.rmtree(web_dir)
+    os.makedirs(os.path.join(web_dir, "static"))
+    for module in glob.glob("*.py"):
+        if module not in TOOL_MODULES:
+            shutil.copy2(module, web_dir)
+    shutil.copy2(WORLD_DATA_PATH, web_dir)
+    shutil.copytree(RESUME_DATA_DIR, os.path.join(web_dir, RESUME_DATA_DIR))
+    # Ship the compiled world so the browser skips parsing on first start
+    load_world_definition(WORLD_DATA_PATH, os.path.join(web_dir, WORLD_CACHE_PATH))
+    for path in (ATLAS_IMAGE, ATLAS_INDEX):
+        shutil.copy2(path, os.path.join(web_dir, path))
+    logger.info(f"Staged web build in {web_dir}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack used sprite regions into a single atlas")
+    parser.add_argument("--web-dir", help="also stage a pygbag folder with only the runtime files")
+    args = parser.parse_args(argv)
+
+    # Asset paths are relative to the game directory
+    web_dir = os.path.abspath(args.web_dir) if args.web_dir else None
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    logging.getLogger().setLevel(logging.INFO)
+    pygame.init()
+    build_atlas()
+    if web_dir:
+        stage_web_build(web_dir)
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
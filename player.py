@@ -1,8 +1,9 @@
 # player.py - Player character class
 
 import pygame
-from config import SCREEN_WIDTH, SCREEN_HEIGHT
-from sprites import get_player_frame
+from config import TICK_MS, PLAYER_SPEED
+from animation import Animator
+from sprites import get_player_clips, get_player_frame
 
 
 class Player:
@@ -11,65 +12,85 @@ class Player:
         self.y = y
         self.width = 32
         self.height = 32
-        self.speed = 3
+        self.speed = PLAYER_SPEED  # pixels per second
         self.direction = 'down'  # down, left, right, up
         self.anim_frame = 0
-        self.anim_timer = 0
-        self.anim_speed = 8  # Lower is faster
+        self.animator = Animator(get_player_clips(), self.direction)
         self.rect = pygame.Rect(x, y, self.width, self.height)
+        self.previous = (x, y)  # Position before the last update, for interpolation
+        self.draw_rect = self.rect.copy()  # Where render() draws, between previous and current
 
-    def update(self, keys, objects):
+    def place(self, x, y):
+        """Move straight to (x, y) without interpolating from the old spot"""
+        self.x, self.y = x, y
+        self.previous = (x, y)
+        self.rect.topleft = (x, y)
+        self.draw_rect.topleft = (x, y)
+
+    def update(self, keys, world, dt=TICK_MS):
+        """Move and animate the player; dt is the elapsed time in milliseconds"""
+        self.previous = (self.x, self.y)
+        step = self.speed * dt / 1000
         new_x, new_y = self.x, self.y
         moved = False
         prev_direction = self.direction
 
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            new_x -= self.speed
+            new_x -= step
             self.direction = 'left'
             moved = True
         elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            new_x += self.speed
+            new_x += step
             self.direction = 'right'
             moved = True
         elif keys[pygame.K_UP] or keys[pygame.K_w]:
-            new_y -= self.speed
+            new_y -= step
             self.direction = 'up'
             moved = True
         elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            new_y += self.speed
+            new_y += step
             self.direction = 'down'
             moved = True
 
         # Check if new position would result in collision
-        temp_rect = pygame.Rect(new_x, new_y, self.width, self.height)
-        collision = False
-        for obj in objects:
-            if obj.rect.colliderect(temp_rect):
-                collision = True
-                break
-        if not collision:
+        temp_rect = pygame.Rect(round(new_x), round(new_y), self.width, self.height)
+        if not world.is_blocked(temp_rect):
             self.x, self.y = new_x, new_y
-            self.rect.x, self.rect.y = new_x, new_y
 
-        # Keep player within screen bounds
-        self.x = max(0, min(SCREEN_WIDTH - self.width, self.x))
-        self.y = max(0, min(SCREEN_HEIGHT - self.height, self.y))
-        self.rect.x, self.rect.y = self.x, self.y
+        # Keep player within world bounds
+        world_width, world_height = world.size
+        self.x = max(0, min(world_width - self.width, self.x))
+        self.y = max(0, min(world_height - self.height, self.y))
+        self.rect.x, self.rect.y = round(self.x), round(self.y)
 
         # Animation logic
+        self.animator.play(self.direction)
         if moved:
-            self.anim_timer += 1
-            if self.anim_timer >= self.anim_speed:
-                self.anim_frame = (self.anim_frame + 1) % 3  # 3 frames per direction
-                self.anim_timer = 0
+            self.animator.update(dt)
+            self.anim_frame = self.animator.frame_index
         else:
+            self.animator.play(self.direction, restart=True)
             self.anim_frame = 1  # Idle frame (usually the middle one)
 
-    def render(self, screen):
+    def hold(self):
+        """Spend a tick standing still, so interpolation stops drawing the last step"""
+        self.previous = (self.x, self.y)
+
+    def interpolate(self, alpha):
+        """Set draw_rect alpha of the way from the previous position to the current one"""
+        x = self.previous[0] + (self.x - self.previous[0]) * alpha
+        y = self.previous[1] + (self.y - self.previous[1]) * alpha
+        self.draw_rect.topleft = (round(x), round(y))
+
+    def render(self, screen, offset=(0, 0)):
         frame = get_player_frame(self.direction, self.anim_frame)
-        screen.blit(frame, (self.x, self.y))
+        screen.blit(frame, (self.draw_rect.x - offset[0], self.draw_rect.y - offset[1]))
+
+    def get_draw_rect(self, offset=(0, 0)):
+        """Screen area touched by render()"""
+        return self.draw_rect.move(-offset[0], -offset[1])
 
-    def get_interaction_target(self, objects):
+    def get_interaction_target(self, world):
         # Check for objects in front of the player
         interaction_range = 20
         dx, dy = 0, 0
@@ -87,7 +108,4 @@ class Player:
             self.width + interaction_range,
             self.height + interaction_range
         )
-        for obj in objects:
-            if interaction_rect.colliderect(obj.rect):
-                return obj
-        return None
\ No newline at end of file
+        return world.find_interactable(interaction_rect, self.rect.center)
\ No newline at end of file
@@ -0,0 +1,94 @@
+# presenter.py - Scales the native game surface onto the window
+
+import pygame
+from config import BLACK, INTEGER_SCALING
+
+
+class Presenter:
+    """Upscales a fixed-size game surface into a letterboxed area of the window.
+
+    Scaling writes straight into a subsurface of the window that is only
+    rebuilt when the window changes, so presenting allocates nothing per frame.
+    """
+
+    def __init__(self, native_size, integer_scaling=INTEGER_SCALING):
+        self.native_size = native_size
+        self.integer_scaling = integer_scaling
+        self.window = None
+        self.window_size = None
+        self.dest_rect = None
+        self.dest_surface = None
+        self.scale = 1.0
+        self.needs_clear = True
+
+    def compute_dest_rect(self, window_size):
+        native_w, native_h = self.native_size
+        window_w, window_h = window_size
+        fit = min(window_w / native_w, window_h / native_h)
+        if self.integer_scaling and fit >= 1:
+            fit = int(fit)
+        width, height = int(native_w * fit), int(native_h * fit)
+        rect = pygame.Rect(0, 0, width, height)
+        rect.center = (window_w // 2, window_h // 2)
+        return rect, fit
+
+    def layout(self, window):
+        """Recompute the destination area if the window surface or its size changed"""
+        window_size = window.get_size()
+        if window is self.window and window_size == self.window_size:
+            return
+        self.window = window
+        self.window_size = window_size
+        self.dest_rect, self.scale = self.compute_dest_rect(window_size)
+        self.dest_surface = window.subsurface(self.dest_rect)
+        self.needs_clear = True
+
+    @property
+    def is_identity(self):
+        return self.dest_rect.size == self.native_size
+
+    def present(self, window, source):
+        """Copy the whole source onto the window, clearing letterbox bars when needed"""
+        self.layout(window)
+        if self.needs_clear:
+            window.fill(BLACK)
+            self.needs_clear = False
+        if self.is_identity:
+            self.dest_surface.blit(source, (0, 0))
+        else:
+            pygame.transform.scale(source, self.dest_rect.size, self.dest_surface)
+
+    def present_rects(self, window, source, rects):
+        """Copy only the given source rects and return the window rects they cover.
+
+        Returns None when the layout changed or the scale is fractional, in
+        which case present() must be used instead.
+        """
+        self.layout(window)
+        if self.needs_clear:
+            return None
+        if self.is_identity:
+            for rect in rects:
+                self.dest_surface.blit(source, rect, rect)
+            return [rect.move(self.dest_rect.topleft) for rect in rects]
+
+        if self.scale != int(self.scale):
+            # Fractional scales sample differently per region; rescale everything
+            return None
+
+        scale = int(self.scale)
+        bounds = source.get_rect()
+        window_rects = []
+        for rect in rects:
+            rect = rect.clip(bounds)
+            if not rect.width or not rect.height:
+                continue
+            scaled = pygame.Rect(rect.left * scale, rect.top * scale, rect.width * scale, rect.height * scale)
+            pygame.transform.scale(source.subsurface(rect), scaled.size, self.dest_surface.subsurface(scaled))
+            window_rects.append(scaled.move(self.dest_rect.topleft))
+        return window_rects
+
+    def window_to_native(self, pos):
+        """Map a window position (e.g. a mouse event) into native game coordinates"""
+        return (int((pos[0] - self.dest_rect.left) / self.scale),
+                int((pos[1] - self.dest_rect.top) / self.scale))
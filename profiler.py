@@ -0,0 +1,127 @@
+# profiler.py - Per-phase frame timing with rolling percentiles and an on-screen HUD
+
+import csv
+import json
+import logging
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pygame
+import config
+from config import FRAME_STATS_WINDOW, FRAME_HUD_REFRESH_MS, BLACK, WHITE, YELLOW, create_pixel_text
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+class FrameProfiler:
+    """Times named phases of each frame and keeps a rolling window per phase"""
+
+    def __init__(self, window=FRAME_STATS_WINDOW):
+        self.window = window
+        self.samples = {}  # phase name -> deque of milliseconds
+        self.current = {}
+        self.frame_start = None
+        self.frame_count = 0
+        self.hud_visible = False
+        self.hud_surface = None
+        self.hud_updated_at = 0
+
+    def begin_frame(self):
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.current[name] = self.current.get(name, 0.0) + elapsed
+
+    def end_frame(self):
+        if self.frame_start is None:
+            return
+        self.current["frame"] = (time.perf_counter() - self.frame_start) * 1000
+        for name, elapsed in self.current.items():
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.window)
+            self.samples[name].append(elapsed)
+        self.frame_count += 1
+        self.frame_start = None
+
+    def summary(self):
+        """Return {phase: {p50, p95, p99, mean, max}} in milliseconds over the window"""
+        stats = {}
+        for name, values in self.samples.items():
+            ordered = sorted(values)
+            entry = {f"p{pct}": percentile(ordered, pct) for pct in PERCENTILES}
+            entry["mean"] = sum(ordered) / len(ordered) if ordered else 0.0
+            entry["max"] = ordered[-1] if ordered else 0.0
+            entry["samples"] = len(ordered)
+            stats[name] = entry
+        return stats
+
+    def export(self, path):
+        """Write the summary to path as JSON, or CSV when the path ends in .csv"""
+        stats = self.summary()
+        try:
+            if path.endswith(".csv"):
+                fields = [f"p{pct}" for pct in PERCENTILES] + ["mean", "max", "samples"]
+                with open(path, "w", newline="") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(["phase"] + fields)
+                    for name, entry in stats.items():
+                        writer.writerow([name] + [entry[field] for field in fields])
+            else:
+                with open(path, "w") as f:
+                    json.dump({"frames": self.frame_count, "window": self.window, "phases": stats}, f, indent=2)
+            logger.info(f"Frame stats written to {path}")
+        except OSError as e:
+            logger.error(f"Could not write frame stats to {path}: {str(e)}")
+
+    def toggle_hud(self):
+        self.hud_visible = not self.hud_visible
+        self.hud_surface = None
+
+    def compose_hud(self):
+        stats = self.summary()
+        lines = [("phase       p50    p95    p99  (ms)", YELLOW)]
+        for name, entry in stats.items():
+            lines.append((f"{name:<10}{entry['p50']:>6.2f} {entry['p95']:>6.2f} {entry['p99']:>6.2f}", WHITE))
+        rendered = [create_pixel_text(text, config.small_font, color) for text, color in lines]
+        line_height = max(surface.get_height() for surface in rendered)
+        width = max(surface.get_width() for surface in rendered) + 16
+        height = line_height * len(rendered) + 12
+        if self.hud_surface is not None:
+            # Never shrink, so each refresh fully covers the previous HUD
+            width = max(width, self.hud_surface.get_width())
+            height = max(height, self.hud_surface.get_height())
+        surface = pygame.Surface((width, height))
+        surface.fill(BLACK)
+        for i, text_surface in enumerate(rendered):
+            surface.blit(text_surface, (8, 6 + i * line_height))
+        return surface
+
+    def render_hud(self, screen):
+        """Draw the HUD in the window's top-left corner and return the rect it covers"""
+        now = pygame.time.get_ticks()
+        if self.hud_surface is None or now - self.hud_updated_at >= FRAME_HUD_REFRESH_MS:
+            self.hud_surface = self.compose_hud()
+            self.hud_updated_at = now
+        return screen.blit(self.hud_surface, (0, 0))
+
+
+frame_profiler = FrameProfiler()
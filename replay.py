@@ -0,0 +1,100 @@
+# replay.py - Deterministic input recording and replay
+
+import gzip
+import json
+import logging
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+REPLAY_VERSION = 2
+READABLE_VERSIONS = (1, 2)  # Version 1 predates mouse wheel input
+
+# Keys polled through pygame.key.get_pressed() by Player.update, stored as a bitmask
+TRACKED_KEYS = [
+    pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d,
+    pygame.K_UP, pygame.K_w, pygame.K_DOWN, pygame.K_s,
+]
+KEY_BITS = {key: 1 << i for i, key in enumerate(TRACKED_KEYS)}
+
+
+def keys_to_mask(keys):
+    mask = 0
+    for key, bit in KEY_BITS.items():
+        if keys[key]:
+            mask |= bit
+    return mask
+
+
+class ReplayKeys:
+    """Stands in for pygame.key.get_pressed() using a recorded bitmask"""
+
+    def __init__(self, mask):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        return bool(self.mask & KEY_BITS.get(key, 0))
+
+
+class InputRecorder:
+    """Records keydown events, mouse wheel scrolling and held movement keys for every frame.
+
+    Each frame is stored as [dt_ms, pressed_mask, [keydown codes]] in a
+    gzipped JSON file together with the random seed used for the world,
+    with the frame's summed wheel notches appended when it scrolled.
+    """
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.frames = []
+        self.pending_keydowns = []
+        self.pending_wheel = 0
+
+    def record_keydown(self, key):
+        self.pending_keydowns.append(key)
+
+    def record_wheel(self, notches):
+        self.pending_wheel += notches
+
+    def end_frame(self, dt, keys):
+        frame = [dt, keys_to_mask(keys), self.pending_keydowns]
+        if self.pending_wheel:
+            frame.append(self.pending_wheel)
+        self.frames.append(frame)
+        self.pending_keydowns = []
+        self.pending_wheel = 0
+
+    def save(self, path):
+        data = {"version": REPLAY_VERSION, "seed": self.seed, "frames": self.frames}
+        try:
+            with gzip.open(path, "wt") as f:
+                json.dump(data, f, separators=(",", ":"))
+            logger.info(f"Recorded {len(self.frames)} frames to {path}")
+        except OSError as e:
+            logger.error(f"Could not save recording to {path}: {str(e)}")
+
+
+class InputReplay:
+    """Plays back a recording one frame at a time"""
+
+    def __init__(self, path):
+        with gzip.open(path, "rt") as f:
+            data = json.load(f)
+        if data.get("version") not in READABLE_VERSIONS:
+            raise ValueError(f"Unsupported replay version: {data.get('version')}")
+        self.seed = data["seed"]
+        self.frames = data["frames"]
+        self.position = 0
+
+    @property
+    def finished(self):
+        return self.position >= len(self.frames)
+
+    def next_frame(self):
+        """Return (recorded dt, keys, keydown codes, wheel notches) for the next frame, or None at the end"""
+        if self.finished:
+            return None
+        dt, mask, keydowns, *wheel = self.frames[self.position]
+        self.position += 1
+        return dt, ReplayKeys(mask), keydowns, wheel[0] if wheel else 0
@@ -1,85 +1,10 @@
-# resume_data.py - Contains all the resume information for the game
+# resume_data.py - The resume information shown in the game
+#
+# The content lives in the files in RESUME_DATA_DIR; edit those rather than this
+# module (resume_loader.py describes their format). Reloads update RESUME_DATA
+# in place, so modules that imported it always see the current content.
 
-# ---- REPLACE WITH YOUR DATA ----
-RESUME_DATA = {
-    # Player information - Replace with your personal info
-    "PLAYER_NAME": "Your Name",
-    "PLAYER_TITLE": "Software Developer",
-    "PERSONAL_SUMMARY": "Passionate developer with expertise in Python and web technologies. Focused on creating efficient, user-friendly applications.",
+from config import RESUME_DATA_DIR
+from resume_loader import load_resume
 
-    # Skills - Replace with your actual skills
-    "SKILLS": [
-        {"name": "Python", "level": 95},
-        {"name": "JavaScript", "level": 85},
-        {"name": "React", "level": 80},
-        {"name": "Django", "level": 85},
-        {"name": "SQL", "level": 75},
-        {"name": "Git", "level": 90},
-    ],
-
-    # Experience - Replace with your work experience
-    "EXPERIENCE": [
-        {
-            "title": "Senior Developer",
-            "company": "Tech Solutions Inc.",
-            "duration": "2019-Present",
-            "description": "Lead developer for web applications using Python and React. Managed team of 5 developers."
-        },
-        {
-            "title": "Web Developer",
-            "company": "Digital Creations",
-            "duration": "2017-2019",
-            "description": "Developed responsive websites and improved application performance by 40%."
-        },
-        {
-            "title": "Junior Developer",
-            "company": "StartUp Innovations",
-            "duration": "2015-2017",
-            "description": "Created front-end interfaces and implemented database solutions for small business clients."
-        }
-    ],
-
-    # Education - Replace with your education
-    "EDUCATION": [
-        {
-            "degree": "Bachelor of Science in Computer Science",
-            "school": "Tech University",
-            "year": "2015",
-            "details": "Graduated with honors. Specialized in software engineering."
-        },
-        {
-            "degree": "Associate's Degree in Web Development",
-            "school": "Community College",
-            "year": "2013",
-            "details": "Dean's list all semesters. Capstone project won department award."
-        }
-    ],
-
-    # Projects - Replace with your projects
-    "PROJECTS": [
-        {
-            "name": "E-commerce Platform",
-            "tech": "Django, React, PostgreSQL",
-            "description": "Full-stack solution with integrated payment processing and inventory management."
-        },
-        {
-            "name": "Task Management App",
-            "tech": "React Native, Firebase",
-            "description": "Mobile application for task organization with cloud synchronization."
-        },
-        {
-            "name": "Data Visualization Dashboard",
-            "tech": "Python, D3.js, Flask",
-            "description": "Interactive dashboard displaying real-time metrics and analytics."
-        }
-    ],
-
-    # Contact information - Replace with your information
-    "CONTACT": {
-        "email": "your.email@example.com",
-        "phone": "555-123-4567",
-        "website": "www.yourwebsite.com",
-        "github": "github.com/yourusername",
-        "linkedin": "linkedin.com/in/yourprofile"
-    }
-}
\ No newline at end of file
+RESUME_DATA = load_resume(RESUME_DATA_DIR)
@@ -0,0 +1,228 @@
+# resume_loader.py - Loads the resume files, validates them and reloads them when they change
+#
+# Each section lives in its own file in RESUME_DATA_DIR, named after the section
+# with a .json, .yaml/.yml or .md extension:
+#   profile     name, title and summary
+#   skills      list of {name, level} with level 0-100
+#   experience  list of {title, company, duration, description}
+#   education   list of {degree, school, year, details}
+#   projects    list of {name, tech, description}
+#   contact     label -> value
+#
+# Markdown files use a small subset: "## Heading" starts a list entry and fills
+# its first field, "key: value" lines (bulleted or not) set fields, and other
+# text goes into the section's text field (summary, description or details).
+# Any other heading is ignored. YAML needs PyYAML, which is optional.
+#
+# Files are validated as they are loaded, so the game can use the data without
+# checking it again. Numbers given for text fields (a year, a phone number) are
+# kept as text.
+
+import json
+import logging
+import os
+import re
+from collections import namedtuple
+from config import RESUME_DATA_DIR, RESUME_RELOAD_INTERVAL_MS
+from validation import expect, is_int
+
+logger = logging.getLogger(__name__)
+
+# page: ResumeDisplay section; key: RESUME_DATA key (the profile fills PROFILE_KEYS instead);
+# kind: "record", "list" or "mapping"; fields: name -> str or allowed integer range; text: field
+# Markdown paragraphs fill
+Section = namedtuple("Section", "page key kind fields text")
+
+SECTIONS = {
+    "profile": Section("About Me", None, "record", {"name": str, "title": str, "summary": str}, "summary"),
+    "skills": Section("Skills", "SKILLS", "list", {"name": str, "level": range(0, 101)}, None),
+    "experience": Section("Experience", "EXPERIENCE", "list",
+                          {"title": str, "company": str, "duration": str, "description": str}, "description"),
+    "education": Section("Education", "EDUCATION", "list",
+                         {"degree": str, "school": str, "year": str, "details": str}, "details"),
+    "projects": Section("Projects", "PROJECTS", "list", {"name": str, "tech": str, "description": str}, "description"),
+    "contact": Section("Contact", "CONTACT", "mapping", None, None),
+}
+PROFILE_KEYS = {"name": "PLAYER_NAME", "title": "PLAYER_TITLE", "summary": "PERSONAL_SUMMARY"}
+EXTENSIONS = (".json", ".yaml", ".yml", ".md")
+
+FIELD_LINE = re.compile(r"^(?:[-*]\s+)?(\w[\w ]*?)\s*:\s*(.+)$")
+
+
+def section_files(directory):
+    """Section name -> paths of the files for it in directory"""
+    files = {}
+    for filename in sorted(os.listdir(directory)):
+        stem, ext = os.path.splitext(filename)
+        if stem in SECTIONS and ext.lower() in EXTENSIONS:
+            files.setdefault(stem, []).append(os.path.join(directory, filename))
+    return files
+
+
+def parse_markdown(source, section):
+    """Turn the Markdown subset into the shape a JSON file for the section would have"""
+    top = {}
+    entries = []
+    fields, text = top, []
+    texts = [(top, text)]
+    for line in source.splitlines():
+        line = line.strip()
+        if line.startswith("#"):
+            if section.kind == "list" and line.startswith("## "):
+                fields, text = {next(iter(section.fields)): line[3:].strip()}, []
+                entries.append(fields)
+                texts.append((fields, text))
+            continue
+        match = FIELD_LINE.match(line)
+        if match and (section.kind == "mapping" or match.group(1) in section.fields):
+            name, value = match.groups()
+            if section.fields and section.fields[name] is not str and value.isdigit():
+                value = int(value)
+            fields[name] = value
+        elif line and section.text:
+            text.append(line)
+    for fields, lines in texts:
+        if lines:
+            fields.setdefault(section.text, " ".join(lines))
+    return entries if section.kind == "list" else top
+
+
+def parse_file(path, section):
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        return json.loads(source)
+    if ext == ".md":
+        return parse_markdown(source, section)
+    try:
+        import yaml
+    except ImportError:
+        raise ValueError("YAML files need PyYAML (pip install pyyaml)") from None
+    try:
+        return yaml.safe_load(source)
+    except yaml.YAMLError as e:
+        raise ValueError(str(e)) from e
+
+
+def check_text(where, value):
+    if is_int(value) or isinstance(value, float):
+        value = str(value)
+    expect(isinstance(value, str) and value.strip(), where, "must be non-empty text")
+    return value.strip()
+
+
+def check_record(where, record, fields):
+    expect(isinstance(record, dict), where, "must be an object")
+    unknown = set(record) - fields.keys()
+    expect(not unknown, where, f"unknown fields {', '.join(sorted(map(str, unknown)))}")
+    checked = {}
+    for name, kind in fields.items():
+        expect(record.get(name) is not None, where, f"needs {name}")
+        value = record[name]
+        if kind is str:
+            value = check_text(f"{where}.{name}", value)
+        else:
+            expect(is_int(value) and value in kind, f"{where}.{name}",
+                   f"must be an integer {kind.start}-{kind.stop - 1}")
+        checked[name] = value
+    return checked
+
+
+def validate_section(name, data):
+    """Check parsed data against the section's schema and return it normalized; raises ValueError"""
+    section = SECTIONS[name]
+    if section.kind == "record":
+        return check_record(name, data, section.fields)
+    if section.kind == "list":
+        expect(isinstance(data, list), name, "must be a list")
+        return [check_record(f"{name}[{i}]", entry, section.fields) for i, entry in enumerate(data)]
+    expect(isinstance(data, dict), name, "must be an object")
+    return {check_text(name, label): check_text(f"{name}.{label}", value) for label, value in data.items()}
+
+
+def load_section(path, name):
+    """Parse and validate one section file; raises ValueError naming the file"""
+    try:
+        return validate_section(name, parse_file(path, SECTIONS[name]))
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from e
+
+
+def apply_section(resume, name, data):
+    """Store a validated section in the resume dict, replacing what it held before"""
+    if name == "profile":
+        for field, key in PROFILE_KEYS.items():
+            resume[key] = data[field]
+    else:
+        resume[SECTIONS[name].key] = data
+
+
+def load_resume(directory=RESUME_DATA_DIR):
+    """Load and validate every section in directory; raises ValueError if any is missing or invalid"""
+    files = section_files(directory)
+    resume = {}
+    for name in SECTIONS:
+        paths = files.get(name, [])
+        expect(paths, directory, f"no {name} file ({'/'.join(EXTENSIONS)})")
+        expect(len(paths) == 1, directory, f"several {name} files: {', '.join(paths)}")
+        apply_section(resume, name, load_section(paths[0], name))
+    logger.info(f"Loaded resume from {directory}")
+    return resume
+
+
+class ResumeWatcher:
+    """Reloads resume sections whose files change, for editing while the game runs.
+
+    Each poll lists the directory and stats the section files, at most once
+    per interval. Only changed files are parsed and validated again; a file
+    that fails keeps its last good content and the error is logged once.
+    """
+
+    def __init__(self, resume, directory=RESUME_DATA_DIR, interval_ms=RESUME_RELOAD_INTERVAL_MS):
+        self.resume = resume
+        self.directory = directory
+        self.interval_ms = interval_ms
+        self.next_poll = 0
+        self.stamps = self.scan()
+
+    def scan(self):
+        """Section name -> (path, mtime) of its file, or None if it has no single file"""
+        try:
+            files = section_files(self.directory)
+        except OSError as e:
+            logger.error(f"Could not list {self.directory}: {str(e)}")
+            return {}
+        stamps = {}
+        for name in SECTIONS:
+            paths = files.get(name, [])
+            try:
+                stamps[name] = (paths[0], os.stat(paths[0]).st_mtime_ns) if len(paths) == 1 else None
+            except OSError:
+                stamps[name] = None
+        return stamps
+
+    def poll(self, now):
+        """Reload what changed since the last poll; return the names of the sections reloaded"""
+        if now < self.next_poll:
+            return []
+        self.next_poll = now + self.interval_ms
+        stamps = self.scan()
+        if not stamps:
+            return []
+        reloaded = []
+        for name, stamp in stamps.items():
+            if stamp == self.stamps.get(name):
+                continue
+            self.stamps[name] = stamp
+            if stamp is None:
+                logger.error(f"{self.directory}: needs exactly one {name} file, keeping the loaded one")
+                continue
+            try:
+                apply_section(self.resume, name, load_section(stamp[0], name))
+            except (OSError, ValueError) as e:
+                logger.error(f"Not reloading {name}: {str(e)}")
+                continue
+            logger.info(f"Reloaded {stamp[0]}")
+            reloaded.append(name)
+        return reloaded
@@ -0,0 +1,96 @@
+# scheduler.py - Fixed simulation ticks and the frame pacing that drives them
+
+import asyncio
+import pygame
+from config import FPS, TICK_MS, SIMULATION_MAX_TICKS
+from loader import IS_BROWSER
+from profiler import frame_profiler
+
+
+class FixedTimestep:
+    """Turns real frame times into a whole number of fixed simulation ticks.
+
+    Leftover time carries into the next frame; alpha is how far the present
+    lies between the last tick and the next one, for interpolated drawing.
+    """
+
+    def __init__(self, tick_ms=TICK_MS, max_ticks=SIMULATION_MAX_TICKS):
+        self.tick_ms = tick_ms
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.dropped_ms = 0.0  # Time given up because a frame fell too far behind
+
+    def advance(self, elapsed_ms):
+        """Add a frame's elapsed time and return how many ticks to run"""
+        self.accumulator += elapsed_ms
+        ticks = int(self.accumulator // self.tick_ms)
+        self.accumulator -= ticks * self.tick_ms
+        if ticks > self.max_ticks:
+            self.dropped_ms += (ticks - self.max_ticks) * self.tick_ms
+            ticks = self.max_ticks
+        self.ticks += ticks
+        return ticks
+
+    @property
+    def alpha(self):
+        return self.accumulator / self.tick_ms
+
+
+class DesktopScheduler:
+    """Sleeps out the rest of each frame with pygame's clock (fps=0 runs unthrottled)"""
+
+    def __init__(self, fps=FPS):
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+
+    async def next_frame(self):
+        """Wait for the next frame and return the milliseconds since the last one"""
+        with frame_profiler.phase("tick"):
+            elapsed = self.clock.tick(self.fps)
+        with frame_profiler.phase("yield"):
+            await asyncio.sleep(0)  # Lets background loading tasks run
+        return elapsed
+
+    async def idle(self, timeout_ms):
+        """Sleep until an event arrives or timeout_ms passes; return the events taken off the queue.
+
+        The event that woke us is handed back rather than re-posted, which
+        would put it behind anything that arrived after it.
+        """
+        event = pygame.event.wait(timeout_ms)
+        self.clock.tick()  # Time spent idle is not simulated
+        await asyncio.sleep(0)
+        return [] if event.type == pygame.NOEVENT else [event]
+
+
+class BrowserScheduler:
+    """Hands control back to the page once per frame.
+
+    pygbag resumes the event loop from the browser's animation frame
+    callback, so yielding is all the pacing needed; a clock wait on top of
+    it would only burn frame budget.
+    """
+
+    def __init__(self):
+        self.last = pygame.time.get_ticks()
+
+    async def next_frame(self):
+        with frame_profiler.phase("yield"):
+            await asyncio.sleep(0)
+        now = pygame.time.get_ticks()
+        elapsed, self.last = now - self.last, now
+        return elapsed
+
+    async def idle(self, timeout_ms):
+        # Blocking would freeze the page, so the next animation frame is the heartbeat
+        await asyncio.sleep(0)
+        self.last = pygame.time.get_ticks()
+        return []
+
+
+def create_scheduler(throttle=True):
+    """The scheduler for this platform; throttle=False runs desktop frames back to back"""
+    if IS_BROWSER:
+        return BrowserScheduler()
+    return DesktopScheduler(FPS if throttle else 0)
@@ -2,29 +2,32 @@
 
 import pygame
 import os
+import glob
+import hashlib
+import json
 from config import *
+from animation import AnimationClip, slice_clips
 
 # Asset paths
 PLAYER_SPRITE_SHEET = os.path.join('static', 'Boss', 'Boss', 'Boss.png')
 OBJECTS_SPRITE_SHEET = os.path.join('static', 'gfx', 'gfx', 'objects.png')
 NPC_SPRITE_SHEET = os.path.join('static', '24x32 lying down.png')
 OVERWORLD_SPRITE_SHEET = os.path.join('static', 'gfx', 'gfx', 'Overworld.png')
+INNER_SPRITE_SHEET = os.path.join('static', 'gfx', 'gfx', 'Inner.png')
+CAVE_SPRITE_SHEET = os.path.join('static', 'gfx', 'gfx', 'cave.png')
+FONT_SPRITE_SHEET = os.path.join('static', 'gfx', 'gfx', 'font.png')
+CROWD_SPRITE_SHEET = os.path.join('static', 'gfx', 'gfx', 'NPC_test.png')
+# Animations played from a folder of frame files: name -> (folder, ms per frame).
+# Each .png in the folder becomes the region '<name>_<i>', in file name order.
+FRAME_SEQUENCES = {
+    'boss_walking': (os.path.join('static', 'Boss', 'Boss', 'BossWalking'), 150),
+}
 
-# --- Lazy loading and caching for sprite sheets ---
-_player_sprite_sheet = None
-def get_player_sprite_sheet():
-    global _player_sprite_sheet
-    if _player_sprite_sheet is None:
-        _player_sprite_sheet = pygame.image.load(PLAYER_SPRITE_SHEET).convert_alpha()
-    return _player_sprite_sheet
-
-_objects_sprite_sheet = None
-def get_objects_sprite_sheet():
-    global _objects_sprite_sheet
-    if _objects_sprite_sheet is None:
-        _objects_sprite_sheet = pygame.image.load(OBJECTS_SPRITE_SHEET).convert_alpha()
-    return _objects_sprite_sheet
+# Packed atlas written by pack_assets.py; used instead of the sheets while it is up to date
+ATLAS_IMAGE = os.path.join('static', 'atlas.png')
+ATLAS_INDEX = os.path.join('static', 'atlas.json')
 
+# --- Lazy loading for the NPC sheet (rows not packed into the atlas) ---
 _npc_sprite_sheet = None
 def get_npc_sprite_sheet():
     global _npc_sprite_sheet
@@ -32,83 +35,320 @@ def get_npc_sprite_sheet():
         _npc_sprite_sheet = pygame.image.load(NPC_SPRITE_SHEET).convert_alpha()
     return _npc_sprite_sheet
 
-_overworld_sprite_sheet = None
-def get_overworld_sprite_sheet():
-    global _overworld_sprite_sheet
-    if _overworld_sprite_sheet is None:
-        _overworld_sprite_sheet = pygame.image.load(OVERWORLD_SPRITE_SHEET).convert_alpha()
-    return _overworld_sprite_sheet
-
-# --- Player Sprite Sheet Slicing ---
-# Assume Boss.png is a grid: 4 rows (down, left, right, up), N columns (animation frames)
+# --- Sprite regions ---
+# Player sheet geometry is needed by the region table below
 PLAYER_FRAME_WIDTH = 32  # Adjust if needed
 PLAYER_FRAME_HEIGHT = 32  # Adjust if needed
 PLAYER_DIRECTIONS = ['down', 'right', 'left', 'up']
 PLAYER_FRAMES_PER_DIRECTION = 3  # Adjust if needed
 
+NPC_FRAME_WIDTH = 24
+NPC_FRAME_HEIGHT = 32
+NPC_COLUMNS = 8
+NPC_ROWS = 6
+NPC_TOTAL = NPC_COLUMNS * NPC_ROWS  # 48
+NPC_PACKED_ROWS = 1  # The world only picks NPCs from the first row
+NPC_PACKED_TOTAL = NPC_COLUMNS * NPC_PACKED_ROWS  # NPCs the atlas, and so the web build, can draw
+
+# Wandering crowd walk cycles (crowd.py): one row per direction
+CROWD_FRAME_WIDTH = 16
+CROWD_FRAME_HEIGHT = 32
+CROWD_DIRECTIONS = ['down', 'right', 'up', 'left']
+CROWD_FRAMES_PER_DIRECTION = 4
+
+# Every image region the game draws: name -> (source file, (x, y, w, h) or None for
+# the whole file, trim). pack_assets.py packs exactly these into the atlas; grids
+# are not trimmed so frame offsets stay intact.
+SPRITE_REGIONS = {
+    'player': (PLAYER_SPRITE_SHEET, (0, 0, PLAYER_FRAME_WIDTH * PLAYER_FRAMES_PER_DIRECTION,
+                                     PLAYER_FRAME_HEIGHT * len(PLAYER_DIRECTIONS)), False),
+    'chest': (OBJECTS_SPRITE_SHEET, (32, 16, 16, 16), True),
+    'bush': (OBJECTS_SPRITE_SHEET, (0, 120, 24, 24), True),
+    'rock': (OBJECTS_SPRITE_SHEET, (64, 32, 16, 16), True),
+    'house': (OVERWORLD_SPRITE_SHEET, (96, 0, 80, 80), True),
+    'cave_entrance': (OVERWORLD_SPRITE_SHEET, (168, 504, 48, 40), True),
+    'bookshelf': (INNER_SPRITE_SHEET, (48, 192, 48, 32), True),
+    'npcs': (NPC_SPRITE_SHEET, (0, 0, NPC_FRAME_WIDTH * NPC_COLUMNS, NPC_FRAME_HEIGHT * NPC_PACKED_ROWS), False),
+    'crowd': (CROWD_SPRITE_SHEET, (0, 0, CROWD_FRAME_WIDTH * CROWD_FRAMES_PER_DIRECTION,
+                                   CROWD_FRAME_HEIGHT * len(CROWD_DIRECTIONS)), False),
+    'font': (FONT_SPRITE_SHEET, (0, 0, 240, 48), False),
+    # Map tiles (TILE_SIZE cells) used by tilemap.TILESET
+    'tile_grass': (OVERWORLD_SPRITE_SHEET, (0, 160, TILE_SIZE, TILE_SIZE), False),
+    'tile_grass_tufts': (OVERWORLD_SPRITE_SHEET, (0, 144, TILE_SIZE, TILE_SIZE), False),
+    'tile_bush': (OVERWORLD_SPRITE_SHEET, (32, 224, TILE_SIZE, TILE_SIZE), False),
+    'tile_rock': (OVERWORLD_SPRITE_SHEET, (128, 80, TILE_SIZE, TILE_SIZE), False),
+    'tile_wood_floor': (INNER_SPRITE_SHEET, (0, 48, TILE_SIZE, TILE_SIZE), False),
+    'tile_brick_wall': (INNER_SPRITE_SHEET, (0, 16, TILE_SIZE, TILE_SIZE), False),
+    'tile_door': (INNER_SPRITE_SHEET, (64, 32, TILE_SIZE, TILE_SIZE), False),
+    'tile_cave_floor': (CAVE_SPRITE_SHEET, (0, 16, TILE_SIZE, TILE_SIZE), False),
+    'tile_cave_wall': (CAVE_SPRITE_SHEET, (32, 64, TILE_SIZE, TILE_SIZE), False),
+    'tile_cave_rock': (CAVE_SPRITE_SHEET, (80, 64, TILE_SIZE, TILE_SIZE), False),
+}
+def sequence_regions(name, names=None):
+    """Region names of a frame sequence in frame order, out of names (SPRITE_REGIONS by default)"""
+    names = SPRITE_REGIONS if names is None else names
+    prefix = f'{name}_'
+    frames = [region for region in names if region.startswith(prefix) and region[len(prefix):].isdigit()]
+    return sorted(frames, key=lambda region: int(region[len(prefix):]))
+
+def list_sequence_frames(name, folder):
+    """Frame files of a sequence in order. The web build ships only the atlas, so without
+    the folder the frames are counted in its index instead and have no source file."""
+    paths = sorted(glob.glob(os.path.join(folder, '*.png')))
+    if paths:
+        return paths
+    try:
+        with open(ATLAS_INDEX) as f:
+            return [None] * len(sequence_regions(name, json.load(f)['sprites']))
+    except (OSError, ValueError, KeyError):
+        return []
+
+for _name, (_folder, _) in FRAME_SEQUENCES.items():
+    for _i, _path in enumerate(list_sequence_frames(_name, _folder)):
+        SPRITE_REGIONS[f'{_name}_{_i}'] = (_path, None, False)
+
+def display_ready():
+    # Images loaded before set_mode cannot be converted, so they are not cached
+    return pygame.display.get_surface() is not None
+
+def atlas_sources_digest():
+    """Hash of SPRITE_REGIONS and the modification times of its source images.
+
+    Returns None when a source image is missing: the staged web build ships
+    only the atlas, which is then the one copy of the pixels there is.
+    """
+    digest = hashlib.sha256(repr(sorted(SPRITE_REGIONS.items())).encode())
+    for path in sorted({path for path, _, _ in SPRITE_REGIONS.values() if path}):
+        try:
+            digest.update(f"{path}:{os.stat(path).st_mtime_ns}".encode())
+        except OSError:
+            return None
+    if any(path is None for path, _, _ in SPRITE_REGIONS.values()):
+        return None
+    return digest.hexdigest()
+
+_atlas_index = None
+def load_atlas_index():
+    """Return the packed atlas index, or None if there is no atlas or it no longer matches the sources"""
+    global _atlas_index
+    if _atlas_index is None:
+        _atlas_index = False
+        if os.path.exists(ATLAS_IMAGE) and os.path.exists(ATLAS_INDEX):
+            with open(ATLAS_INDEX) as f:
+                index = json.load(f)
+            expected = atlas_sources_digest()
+            if expected is None or index.get('sources') == expected:
+                _atlas_index = index
+            else:
+                logger.warning(f"{ATLAS_IMAGE} is out of date, using the source images; re-run pack_assets.py")
+    return _atlas_index or None
+
+_atlas = None
+def get_atlas():
+    """Return (atlas surface, index) if an up-to-date packed atlas exists, otherwise None."""
+    global _atlas
+    if _atlas is not None:
+        return _atlas or None
+    atlas = False
+    index = load_atlas_index()
+    if index is not None:
+        surface = load_source_image(ATLAS_IMAGE)
+        if display_ready():
+            logger.info(f"Using sprite atlas {ATLAS_IMAGE} with {len(index['sprites'])} regions")
+        atlas = (surface, index['sprites'])
+    if display_ready():
+        _atlas = atlas
+    return atlas or None
+
+_source_images = {}
+def load_source_image(path):
+    image = _source_images.get(path)
+    if image is None:
+        image = pygame.image.load(path)
+        if display_ready():
+            image = image.convert_alpha()
+            _source_images[path] = image
+    return image
+
+def store_source_image(path, image):
+    """Cache an image decoded elsewhere (e.g. by loader.AssetLoader) under its path"""
+    if display_ready():
+        image = image.convert_alpha()
+        _source_images[path] = image
+    return image
+
+def get_preload_paths(names=None):
+    """Return the image files holding the given regions (all by default), so they can be decoded ahead of use"""
+    if load_atlas_index() is not None:
+        return [ATLAS_IMAGE]
+    names = SPRITE_REGIONS if names is None else names
+    return sorted({SPRITE_REGIONS[name][0] for name in names})
+
+_regions = {}
+def get_region(name) -> pygame.Surface:
+    """Return a named sprite region from the atlas, or from its source image when no atlas was built.
+
+    Regions are shared surfaces; copy before drawing on them.
+    """
+    region = _regions.get(name)
+    if region is not None:
+        return region
+
+    atlas = get_atlas()
+    if atlas and name in atlas[1]:
+        surface, index = atlas
+        entry = index[name]
+        region = surface.subsurface(pygame.Rect(entry['rect']))
+        if tuple(entry['size']) != region.get_size():
+            # Trimmed when packed: restore the transparent border once
+            padded = pygame.Surface(entry['size'], pygame.SRCALPHA)
+            padded.blit(region, entry['offset'])
+            region = padded
+    else:
+        path, rect, _ = SPRITE_REGIONS[name]
+        image = load_source_image(path)
+        region = image.subsurface(pygame.Rect(rect).clip(image.get_rect())) if rect else image
+    if display_ready():
+        _regions[name] = region
+    return region
+
+def release_regions(names):
+    """Forget cached regions, and their source images once no cached region uses them.
+
+    Surfaces already handed out stay valid; they are just no longer shared.
+    """
+    for name in names:
+        _regions.pop(name, None)
+    sprite_registry.release(names)
+    for sequence in [sequence for sequence in _sequence_clips if set(sequence_regions(sequence)) & set(names)]:
+        del _sequence_clips[sequence]
+    in_use = {SPRITE_REGIONS[name][0] for name in _regions if name in SPRITE_REGIONS}
+    for name in names:
+        path = SPRITE_REGIONS[name][0]
+        if path not in in_use:
+            _source_images.pop(path, None)
+
+# --- Shared sprite registry ---
+def surface_bytes(surface):
+    """Pixel bytes a surface covers (a subsurface's pitch is its parent's, so it is not used)"""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+class SpriteRegistry:
+    """Flyweight store handing out one shared surface per sprite key.
+
+    Keys are SPRITE_REGIONS names, or ('npc', index) for a cell of the NPC
+    sheet. Surfaces are shared by every object using the key, so treat
+    them as read-only; copy one before drawing on it.
+    """
+
+    def __init__(self):
+        self.surfaces = {}  # key -> (surface, region it was cut from, or None for a full sheet)
+        self.requests = 0
+
+    @staticmethod
+    def load(key):
+        if isinstance(key, tuple):
+            _, index = key
+            col, row = index % NPC_COLUMNS, index // NPC_COLUMNS
+            # Packed rows come from the atlas; the rest need the full sheet
+            if row < NPC_PACKED_ROWS:
+                region, sheet = 'npcs', get_region('npcs')
+            else:
+                region, sheet = None, get_npc_sprite_sheet()
+            rect = pygame.Rect(col * NPC_FRAME_WIDTH, row * NPC_FRAME_HEIGHT, NPC_FRAME_WIDTH, NPC_FRAME_HEIGHT)
+            return sheet.subsurface(rect), region
+        return get_region(key), key
+
+    def get(self, key):
+        self.requests += 1
+        entry = self.surfaces.get(key)
+        if entry is None:
+            entry = self.load(key)
+            if not display_ready():
+                return entry[0]
+            self.surfaces[key] = entry
+        return entry[0]
+
+    def release(self, regions):
+        """Forget the sprites cut from the given regions"""
+        regions = set(regions)
+        for key in [key for key, (_, region) in self.surfaces.items() if region in regions]:
+            del self.surfaces[key]
+
+    def stats(self):
+        return {
+            "surfaces": len(self.surfaces),
+            "bytes": sum(surface_bytes(surface) for surface, _ in self.surfaces.values()),
+            "requests": self.requests,
+        }
+
+sprite_registry = SpriteRegistry()
+
+def get_sprite(key) -> pygame.Surface:
+    """Return the shared surface for a sprite key (see SpriteRegistry)"""
+    return sprite_registry.get(key)
+
+# --- Player Sprite Sheet Slicing ---
+# Assume Boss.png is a grid: one row per entry of PLAYER_DIRECTIONS, N columns (animation frames)
+PLAYER_FRAME_DURATION = 1000 * 8 // FPS  # ms per frame, matches the old 8-tick timer
+
+_player_clips = None
+def get_player_clips():
+    """Return the player's per-direction clips, slicing the sheet on first use."""
+    global _player_clips
+    if _player_clips is None:
+        rows = {direction: row for row, direction in enumerate(PLAYER_DIRECTIONS)}
+        _player_clips = slice_clips(get_region('player'), rows, PLAYER_FRAME_WIDTH,
+                                    PLAYER_FRAME_HEIGHT, PLAYER_FRAMES_PER_DIRECTION,
+                                    PLAYER_FRAME_DURATION)
+    return _player_clips
+
 def get_player_frame(direction: str, frame: int) -> pygame.Surface:
-    """Return the correct player frame for direction and animation frame index."""
-    sheet = get_player_sprite_sheet()
-    if direction not in PLAYER_DIRECTIONS:
-        direction = 'down'
-    dir_idx = PLAYER_DIRECTIONS.index(direction)
-    frame = frame % PLAYER_FRAMES_PER_DIRECTION
-    rect = pygame.Rect(
-        frame * PLAYER_FRAME_WIDTH,
-        dir_idx * PLAYER_FRAME_HEIGHT,
-        PLAYER_FRAME_WIDTH,
-        PLAYER_FRAME_HEIGHT
-    )
-    return sheet.subsurface(rect).copy()
-
-# --- Object/Environment Sprite Slicing ---
-def get_object_sprite(x, y, w, h) -> pygame.Surface:
-    """Extract a sprite from the objects.png sheet at (x, y) with size (w, h)."""
-    sheet = get_objects_sprite_sheet()
-    rect = pygame.Rect(x, y, w, h)
-    return sheet.subsurface(rect).copy()
-
-# Example: Define some common object sprites (coordinates must be set by inspecting objects.png)
-# These coordinates are EXAMPLES. Adjust them to match your actual objects.png layout.
+    """Return the correct player frame for direction and animation frame index.
+
+    Frames are shared, precomputed surfaces; do not draw on them.
+    """
+    clips = get_player_clips()
+    clip = clips.get(direction) or clips['down']
+    return clip.frames[frame % len(clip)]
+
+_sequence_clips = {}
+def get_sequence_clip(name):
+    """Return the looping clip of a FRAME_SEQUENCES entry, built on first use."""
+    clip = _sequence_clips.get(name)
+    if clip is None:
+        frames = [get_region(region) for region in sequence_regions(name)]
+        clip = AnimationClip(frames, FRAME_SEQUENCES[name][1])
+        if display_ready():
+            _sequence_clips[name] = clip
+    return clip
+
+# --- Object/Environment sprites ---
+# Common object sprites; these are shared registry surfaces (see SpriteRegistry)
 def get_chest_sprite():
-    return get_object_sprite(32, 16, 16, 16)
+    return get_sprite('chest')
 
 def get_bush_sprite():
-    return get_object_sprite(0, 120, 24, 24)
+    return get_sprite('bush')
 
 def get_rock_sprite():
-    return get_object_sprite(64, 32, 16, 16)
+    return get_sprite('rock')
 
 # You can add more as needed, e.g. HEART_SPRITE, TREE_SPRITE, etc.
 
 # --- NPC Sprite Sheet Slicing ---
-NPC_FRAME_WIDTH = 24
-NPC_FRAME_HEIGHT = 32
-NPC_COLUMNS = 8
-NPC_ROWS = 6
-NPC_TOTAL = NPC_COLUMNS * NPC_ROWS  # 48
-
 def get_npc_sprite(index: int) -> pygame.Surface:
-    sheet = get_npc_sprite_sheet()
+    """Return the shared sprite of an NPC sheet cell"""
     if index < 0 or index >= NPC_TOTAL:
         index = 0
-    col = index % NPC_COLUMNS
-    row = index // NPC_COLUMNS
-    rect = pygame.Rect(
-        col * NPC_FRAME_WIDTH,
-        row * NPC_FRAME_HEIGHT,
-        NPC_FRAME_WIDTH,
-        NPC_FRAME_HEIGHT
-    )
-    return sheet.subsurface(rect).copy()
+    return get_sprite(('npc', index))
 
 # --- House Sprite from Overworld.png ---
 def get_house_sprite():
-    # Example: top-left house, adjust coordinates/size as needed
-    sheet = get_overworld_sprite_sheet()
-    rect = pygame.Rect(0, 0, 48, 48)  # (x, y, w, h) - adjust if house is larger/smaller
-    return sheet.subsurface(rect).copy()
+    # Example: top-left house, adjust coordinates/size in SPRITE_REGIONS
+    return get_sprite('house')
 
 # --- Usage in Game ---
-# For player: call get_player_frame(direction, frame) to get the correct image
-# For objects: use CHEST_SPRITE, BUSH_SPRITE, etc. when creating GameObject instances
\ No newline at end of file
+# For player: use get_player_clips() with an animation.Animator, or get_player_frame(direction, frame)
+# For animated objects: pass animation.Animator({name: get_sequence_clip(name)}, name) to GameObject
+# For objects: pass get_sprite(name) (or get_chest_sprite() etc.) to GameObject; instances share the surface
\ No newline at end of file
@@ -0,0 +1,155 @@
+# tilemap.py - Chunked tile layers with a compact collision grid
+
+from collections import OrderedDict
+import pygame
+from config import TILE_SIZE, TILEMAP_CHUNK_TILES
+from sprites import get_region
+
+# Tile index -> (sprite region, solid). Index 0 is empty and draws nothing.
+TILESET = (
+    (None, False),
+    ('tile_grass', False),
+    ('tile_grass_tufts', False),
+    ('tile_bush', True),
+    ('tile_rock', True),
+    ('tile_wood_floor', False),
+    ('tile_brick_wall', True),
+    ('tile_door', False),
+    ('tile_cave_floor', False),
+    ('tile_cave_wall', True),
+    ('tile_cave_rock', True),
+)
+TILE_IDS = {name: index for index, (name, _) in enumerate(TILESET) if name}
+EMPTY = 0
+
+_tile_surfaces = {}
+def get_tile_surface(tile):
+    """Return the surface for a TILESET index, loading its region on first use"""
+    surface = _tile_surfaces.get(tile)
+    if surface is None:
+        surface = _tile_surfaces[tile] = get_region(TILESET[tile][0])
+    return surface
+
+def release_tiles(names):
+    """Drop cached tile surfaces so their regions can be released"""
+    for name in names:
+        _tile_surfaces.pop(TILE_IDS.get(name), None)
+
+
+class TileMap:
+    """Layers of tile indices, drawn a chunk at a time.
+
+    Each layer is a row-major bytearray of TILESET indices, drawn in order.
+    The collision grid is a bytearray with 1 for every cell where any layer
+    holds a solid tile. build_chunk draws a CHUNK_TILES square of the map;
+    the GameArea showing the map bakes and caches those chunks, and
+    on_change tells it which part to rebake after an edit.
+    """
+
+    def __init__(self, width, height, layers=("ground", "decor"), background_color=None,
+                 tile_size=TILE_SIZE, chunk_tiles=TILEMAP_CHUNK_TILES):
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.chunk_tiles = chunk_tiles
+        self.background_color = background_color  # Opaque chunks when set, transparent otherwise
+        self.layers = OrderedDict((name, bytearray(width * height)) for name in layers)
+        self.solid = bytearray(width * height)
+        self.on_change = None  # Called with the pixel rect of every edited cell
+        self.chunks_built = 0
+
+    @classmethod
+    def from_compiled(cls, width, height, layers, solid, background_color=None):
+        """Build a map from ((layer name, tile bytes), ...) and a matching solid grid"""
+        tilemap = cls(width, height, [name for name, _ in layers], background_color)
+        for name, tiles in layers:
+            tilemap.layers[name] = bytearray(tiles)
+        tilemap.solid = bytearray(solid)
+        return tilemap
+
+    @property
+    def pixel_size(self):
+        return (self.width * self.tile_size, self.height * self.tile_size)
+
+    def in_bounds(self, tx, ty):
+        return 0 <= tx < self.width and 0 <= ty < self.height
+
+    def get_tile(self, layer, tx, ty):
+        return self.layers[layer][ty * self.width + tx]
+
+    def set_tile(self, layer, tx, ty, tile):
+        """Place a tile and report its cell to on_change, so whatever baked it draws it again"""
+        index = ty * self.width + tx
+        self.layers[layer][index] = tile
+        self.solid[index] = any(TILESET[tiles[index]][1] for tiles in self.layers.values())
+        if self.on_change is not None:
+            size = self.tile_size
+            self.on_change(pygame.Rect(tx * size, ty * size, size, size))
+
+    def fill(self, layer, tile, rect=None):
+        """Fill a rect given in tiles (the whole map by default)"""
+        rect = pygame.Rect(rect or (0, 0, self.width, self.height)).clip(0, 0, self.width, self.height)
+        for ty in range(rect.top, rect.bottom):
+            for tx in range(rect.left, rect.right):
+                self.set_tile(layer, tx, ty, tile)
+
+    def is_solid(self, tx, ty):
+        """Cells outside the map count as solid"""
+        return not self.in_bounds(tx, ty) or bool(self.solid[ty * self.width + tx])
+
+    def blocked(self, rect):
+        """Return True if the pixel rect overlaps a solid cell or leaves the map"""
+        size = self.tile_size
+        x0, y0 = rect.left // size, rect.top // size
+        x1, y1 = (rect.right - 1) // size, (rect.bottom - 1) // size
+        if x0 < 0 or y0 < 0 or x1 >= self.width or y1 >= self.height:
+            return True
+        for ty in range(y0, y1 + 1):
+            row = ty * self.width
+            if any(self.solid[row + x0:row + x1 + 1]):
+                return True
+        return False
+
+    def chunk_rect(self, cx, cy):
+        span = self.chunk_tiles * self.tile_size
+        return pygame.Rect(cx * span, cy * span, span, span).clip(pygame.Rect((0, 0), self.pixel_size))
+
+    def build_chunk(self, cx, cy):
+        rect = self.chunk_rect(cx, cy)
+        if self.background_color is not None:
+            chunk = pygame.Surface(rect.size).convert()
+            chunk.fill(self.background_color)
+        else:
+            chunk = pygame.Surface(rect.size, pygame.SRCALPHA)
+        size = self.tile_size
+        tx0, ty0 = cx * self.chunk_tiles, cy * self.chunk_tiles
+        tx1 = min(tx0 + self.chunk_tiles, self.width)
+        ty1 = min(ty0 + self.chunk_tiles, self.height)
+        for tiles in self.layers.values():
+            blits = []
+            for ty in range(ty0, ty1):
+                row = ty * self.width
+                for tx in range(tx0, tx1):
+                    tile = tiles[row + tx]
+                    if tile:
+                        blits.append((get_tile_surface(tile), ((tx - tx0) * size, (ty - ty0) * size)))
+            chunk.blits(blits, doreturn=False)
+        self.chunks_built += 1
+        return chunk
+
+    def stats(self):
+        return {
+            "tiles": self.width * self.height,
+            "chunks_built": self.chunks_built,
+            "grid_bytes": self.grid_bytes(),
+        }
+
+    def grid_bytes(self):
+        return len(self.solid) * (len(self.layers) + 1)
+
+    def used_tiles(self):
+        """Names of the tiles placed anywhere on the map"""
+        used = set()
+        for tiles in self.layers.values():
+            used.update(tiles)
+        return {TILESET[tile][0] for tile in used if tile}
@@ -1,6 +1,10 @@
 # ui_systems.py - UI elements like dialog boxes, menus, and resume display
 
+import bisect
+from abc import ABC, abstractmethod
+from collections import OrderedDict
 import pygame
+import config
 from config import *
 from sprites import get_player_frame  # Only import what is needed
 from resume_data import RESUME_DATA
@@ -19,95 +23,243 @@ def create_dialog_box(width, height):
     pygame.draw.rect(dialog_surface, (255, 200, 0), (width - 12, height - 12, 12, 12))
     return dialog_surface
 
+def wrap_text(text, font, width):
+    """Split text into lines no wider than width, measured with the real font"""
+    lines = []
+    line = ""
+    for word in text.split():
+        test_line = line + " " + word if line else word
+        if not line or font.size(test_line)[0] <= width:
+            line = test_line
+        else:
+            lines.append(line)
+            line = word
+    if line:
+        lines.append(line)
+    return lines
+
+# Loading screen, drawn before any game font exists
+_loading_font = None
+def render_loading_screen(screen, progress, label="Loading...", detail=None):
+    global _loading_font
+    if _loading_font is None:
+        # pygame's bundled font needs no system font lookup
+        _loading_font = pygame.font.Font(None, 32)
+    screen.fill(BLUE)
+    text = _loading_font.render(label, True, WHITE)
+    screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 - 50))
+    bar = pygame.Rect(0, 0, SCREEN_WIDTH // 2, 20)
+    bar.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    pygame.draw.rect(screen, DARK_GRAY, bar)
+    pygame.draw.rect(screen, YELLOW, (bar.x, bar.y, int(bar.width * max(0.0, min(1.0, progress))), bar.height))
+    pygame.draw.rect(screen, WHITE, bar, 2)
+    if detail:
+        y = bar.bottom + 30
+        for line in wrap_text(detail, _loading_font, SCREEN_WIDTH - 160):
+            text = _loading_font.render(line, True, YELLOW)
+            screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, y))
+            y += text.get_height() + 4
+
+
+# Retained-mode layer: static content is composed once per state
+class CachedLayer(ABC):
+    """Keeps the surfaces composed for the last max_layers states, least recently used dropped first"""
+    max_layers = 1
+
+    def __init__(self):
+        self.layers = OrderedDict()  # (state, size) -> surface
+
+    @abstractmethod
+    def layer_state(self):
+        """Return a hashable description of everything compose_layer draws"""
+
+    @abstractmethod
+    def compose_layer(self, surface):
+        """Draw the current state onto a transparent surface"""
+
+    def get_layer(self, size):
+        key = (self.layer_state(), size)
+        surface = self.layers.get(key)
+        if surface is None:
+            surface = self.layers[key] = pygame.Surface(size, pygame.SRCALPHA)
+            self.compose_layer(surface)
+            while len(self.layers) > self.max_layers:
+                self.layers.popitem(last=False)
+        else:
+            self.layers.move_to_end(key)
+        return surface
+
+    def invalidate_layer(self, matches=None):
+        """Drop every baked layer, or only those whose state satisfies matches(state)"""
+        if matches is None:
+            self.layers.clear()
+            return
+        for key in [key for key in self.layers if matches(key[0])]:
+            del self.layers[key]
+
+
 # Dialog system
-class DialogSystem:
+class DialogSystem(CachedLayer):
+    line_spacing = 24
+
     def __init__(self):
+        super().__init__()
         self.active = False
         self.current_text = ""
         self.current_title = ""
         self.text_chunks = []
         self.dialog_box = create_dialog_box(SCREEN_WIDTH - 80, 150)
         self.dialog_box_rect = pygame.Rect(40, SCREEN_HEIGHT - 190, SCREEN_WIDTH - 80, 150)
+        self.text_rect = pygame.Rect(60, SCREEN_HEIGHT - 150, SCREEN_WIDTH - 120, 86)
         self.current_page = 0
         self.total_pages = 0
+        # Laid-out pages: each page is a list of (line text, line surface)
+        self.pages = []
+        # Typewriter state for the current page
+        self.revealed_chars = 0
+        self.reveal_progress = 0.0
+        self.partial_surface = None
+        self.partial_key = None
+        self.partial_chars = 0
+
+    def wrap_lines(self, text, font):
+        """Split text into lines that fit the text area"""
+        return wrap_text(text, font, self.text_rect.width)
+
+    def lines_per_page(self, font):
+        return max(1, 1 + (self.text_rect.height - font.get_linesize()) // self.line_spacing)
 
     def show_dialog(self, title, text):
         self.active = True
         self.current_title = title
 
-        # Split text into pages
-        self.text_chunks = []
-        words = text.split()
-        current_chunk = ""
-
-        for word in words:
-            test_chunk = current_chunk + " " + word if current_chunk else word
-            if len(test_chunk) <= 250:  # Rough limit for text in dialog box
-                current_chunk = test_chunk
-            else:
-                self.text_chunks.append(current_chunk)
-                current_chunk = word
-
-        if current_chunk:
-            self.text_chunks.append(current_chunk)
+        # Lay out and rasterize every line once, then split into pages that fit the box
+        font = config.small_font
+        lines = self.wrap_lines(text or "", font)
+        per_page = self.lines_per_page(font)
+        self.pages = [
+            [(line, create_pixel_text(line, font, WHITE)) for line in lines[i:i + per_page]]
+            for i in range(0, len(lines), per_page)
+        ]
+        self.text_chunks = [" ".join(line for line, _ in page) for page in self.pages]
 
         self.current_page = 0
         self.total_pages = len(self.text_chunks)
         self.current_text = self.text_chunks[0] if self.text_chunks else ""
+        self.start_reveal()
+
+    def start_reveal(self):
+        self.partial_surface = None
+        self.partial_key = None
+        self.partial_chars = 0
+        self.reveal_progress = 0.0
+        if DIALOG_TYPEWRITER_CPS > 0:
+            self.revealed_chars = 0
+        else:
+            self.revealed_chars = self.page_length()
+
+    def page_length(self):
+        if not self.pages:
+            return 0
+        return sum(len(line) for line, _ in self.pages[self.current_page])
+
+    @property
+    def fully_revealed(self):
+        return self.revealed_chars >= self.page_length()
+
+    @property
+    def animating(self):
+        return self.active and not self.fully_revealed
+
+    def update(self, dt):
+        """Advance the typewriter reveal by dt milliseconds"""
+        if not self.active or self.fully_revealed:
+            return
+        self.reveal_progress += DIALOG_TYPEWRITER_CPS * dt / 1000
+        whole = int(self.reveal_progress)
+        if whole:
+            self.reveal_progress -= whole
+            self.revealed_chars = min(self.page_length(), self.revealed_chars + whole)
 
     def next_page(self):
-        if self.current_page < self.total_pages - 1:
+        if not self.fully_revealed:
+            self.revealed_chars = self.page_length()
+        elif self.current_page < self.total_pages - 1:
             self.current_page += 1
             self.current_text = self.text_chunks[self.current_page]
+            self.start_reveal()
         else:
             self.active = False
 
-    def render(self, screen):
-        if not self.active:
-            return
+    def layer_state(self):
+        return (self.current_title, self.current_page, self.total_pages)
+
+    def compose_layer(self, surface):
+        # Everything is drawn relative to the dialog box
+        left, top = self.dialog_box_rect.topleft
 
         # Draw dialog box
-        screen.blit(self.dialog_box, (40, SCREEN_HEIGHT - 190))
+        surface.blit(self.dialog_box, (0, 0))
 
         # Draw title
-        title_text = create_pixel_text(self.current_title, medium_font, WHITE)
-        screen.blit(title_text, (60, SCREEN_HEIGHT - 180))
-
-        # Draw content text with word wrapping
-        y_offset = SCREEN_HEIGHT - 150
-        words = self.current_text.split()
-        line = ""
-        line_spacing = 24
-
-        for word in words:
-            test_line = line + word + " "
-            text_width = small_font.size(test_line)[0]
-
-            if text_width < SCREEN_WIDTH - 120:
-                line = test_line
-            else:
-                text_surface = create_pixel_text(line, small_font, WHITE)
-                screen.blit(text_surface, (60, y_offset))
-                y_offset += line_spacing
-                line = word + " "
-
-        if line:
-            text_surface = create_pixel_text(line, small_font, WHITE)
-            screen.blit(text_surface, (60, y_offset))
+        title_text = create_pixel_text(self.current_title, config.medium_font, WHITE)
+        surface.blit(title_text, (60 - left, SCREEN_HEIGHT - 180 - top))
 
         # Draw page indicator if multiple pages
         if self.total_pages > 1:
-            page_text = create_pixel_text(f"Page {self.current_page + 1}/{self.total_pages}", small_font, WHITE)
-            screen.blit(page_text, (SCREEN_WIDTH - 180, SCREEN_HEIGHT - 60))
+            page_text = create_pixel_text(f"Page {self.current_page + 1}/{self.total_pages}", config.small_font, WHITE)
+            surface.blit(page_text, (SCREEN_WIDTH - 180 - left, SCREEN_HEIGHT - 60 - top))
 
         # Draw continue prompt
-        continue_text = create_pixel_text("Press SPACE to continue", small_font, YELLOW)
-        screen.blit(continue_text, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT - 60))
+        continue_text = create_pixel_text("Press SPACE to continue", config.small_font, YELLOW)
+        surface.blit(continue_text, (SCREEN_WIDTH // 2 - 100 - left, SCREEN_HEIGHT - 60 - top))
+
+    def get_partial_line(self, index, text, count):
+        """Return a surface showing the first count characters of a line.
+
+        Only the characters revealed since the last call are rasterized and
+        appended to a per-line buffer. The chunks are rendered directly rather
+        than through create_pixel_text, so the shared text cache only ever
+        holds whole lines.
+        """
+        font = config.small_font
+        key = (self.current_page, index)
+        if key != self.partial_key or count < self.partial_chars:
+            self.partial_surface = pygame.Surface(font.size(text), pygame.SRCALPHA)
+            self.partial_key = key
+            self.partial_chars = 0
+        if count > self.partial_chars:
+            chunk = font.render(text[self.partial_chars:count], True, WHITE)
+            self.partial_surface.blit(chunk, (font.size(text[:self.partial_chars])[0], 0))
+            self.partial_chars = count
+        return self.partial_surface
+
+    def render(self, screen):
+        if not self.active:
+            return
+
+        screen.blit(self.get_layer(self.dialog_box_rect.size), self.dialog_box_rect.topleft)
+        if not self.pages:
+            return
+
+        # Draw the laid-out lines revealed so far
+        remaining = self.revealed_chars
+        x, y = self.text_rect.topleft
+        for index, (line, line_surface) in enumerate(self.pages[self.current_page]):
+            if remaining >= len(line):
+                screen.blit(line_surface, (x, y))
+                remaining -= len(line)
+            else:
+                if remaining:
+                    screen.blit(self.get_partial_line(index, line, remaining), (x, y))
+                break
+            y += self.line_spacing
 
 
 # Menu system
-class MenuSystem:
+class MenuSystem(CachedLayer):
     def __init__(self):
+        super().__init__()
         self.active = False
         self.menu_name = ""
         self.options = []
@@ -134,26 +286,35 @@ class MenuSystem:
     def close(self):
         self.active = False
 
-    def render(self, screen):
-        if not self.active:
-            return
+    def layer_state(self):
+        return (self.menu_name, tuple(self.options))
 
+    def compose_layer(self, surface):
         # Semi-transparent background
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, (0, 0))
+        surface.fill((0, 0, 0, 180))
 
         # Draw title
-        title_text = create_pixel_text(self.menu_name, large_font, WHITE)
-        screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 50))
+        title_text = create_pixel_text(self.menu_name, config.large_font, WHITE)
+        surface.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 50))
+
+        # Draw navigation instructions
+        nav_text = create_pixel_text("↑/↓: Navigate   SPACE: Select   ESC: Back", config.small_font, WHITE)
+        surface.blit(nav_text, (SCREEN_WIDTH // 2 - nav_text.get_width() // 2, SCREEN_HEIGHT - 50))
+
+    def render(self, screen):
+        if not self.active:
+            return
 
-        # Draw options
+        # Cached background, title and instructions
+        screen.blit(self.get_layer(screen.get_size()), (0, 0))
+
+        # Draw options (text surfaces come from the text cache)
         option_spacing = 40
         start_y = 150
 
         for i, option in enumerate(self.options):
             color = YELLOW if i == self.selected_index else WHITE
-            option_text = create_pixel_text(option, medium_font, color)
+            option_text = create_pixel_text(option, config.medium_font, color)
 
             # Draw selection indicator for current option
             if i == self.selected_index:
@@ -167,17 +328,156 @@ class MenuSystem:
                         (SCREEN_WIDTH // 2 - option_text.get_width() // 2,
                          start_y + i * option_spacing))
 
-        # Draw navigation instructions
-        nav_text = create_pixel_text("↑/↓: Navigate   SPACE: Select   ESC: Back", small_font, WHITE)
-        screen.blit(nav_text, (SCREEN_WIDTH // 2 - nav_text.get_width() // 2, SCREEN_HEIGHT - 50))
+
+# Scrolling list of resume entries
+class ResumeList:
+    """Virtualized list of (heading, subheading, body) entries shown inside rect.
+
+    Entries are laid out (wrapped and measured) only once scrolling first
+    comes within overscan of them, and rasterized only while they stay
+    there; surfaces of entries that leave that window are evicted. Cost
+    follows the window, not the number of entries.
+    """
+    line_spacing = 24
+
+    def __init__(self, data, entries, rect, overscan=RESUME_LIST_OVERSCAN):
+        self.data = data  # The resume data the entries came from
+        self.entries = entries
+        self.rect = rect
+        self.overscan = overscan
+        self.scroll = 0
+        # Laid-out entries, in order: top (list pixels), height and [(text, font, color, y)]
+        self.tops = []
+        self.heights = []
+        self.lines = []
+        self.surfaces = {}  # Entry index -> rasterized surface, only near the window
+        self.rasterized = 0
+
+    @property
+    def laid_out_height(self):
+        return self.tops[-1] + self.heights[-1] if self.tops else 0
+
+    def layout_entry(self, entry):
+        heading, subheading, body = entry
+        lines = [(heading, config.medium_font, WHITE, 0), (subheading, config.small_font, YELLOW, 30)]
+        y = 55
+        for line in wrap_text(body, config.small_font, self.rect.width):
+            lines.append((line, config.small_font, WHITE, y))
+            y += self.line_spacing
+        # Divider just under the last line, then the gap before the next entry
+        divider_y = max(y, 55 + self.line_spacing) + 6
+        return divider_y + 15, lines
+
+    def layout_until(self, bottom):
+        """Lay out entries in order until they reach bottom (list pixels) or run out"""
+        while len(self.tops) < len(self.entries) and self.laid_out_height < bottom:
+            top = self.laid_out_height
+            height, lines = self.layout_entry(self.entries[len(self.tops)])
+            self.tops.append(top)
+            self.heights.append(height)
+            self.lines.append(lines)
+
+    def rasterize(self, index):
+        surface = pygame.Surface((self.rect.width, self.heights[index]), pygame.SRCALPHA)
+        for text, font, color, y in self.lines[index]:
+            surface.blit(create_pixel_text(text, font, color), (0, y))
+        divider_y = self.heights[index] - 15
+        pygame.draw.line(surface, GRAY, (0, divider_y), (self.rect.width, divider_y), 2)
+        self.rasterized += 1
+        return surface
+
+    def max_scroll(self):
+        """Furthest scroll position, as far as the entries laid out so far tell"""
+        return max(0, self.laid_out_height - self.rect.height)
+
+    def scroll_to(self, position):
+        self.layout_until(position + self.rect.height + self.overscan)
+        self.scroll = max(0, min(self.max_scroll(), position))
+
+    def scroll_by(self, delta):
+        self.scroll_to(self.scroll + delta)
+
+    def handle_key(self, key):
+        """Scroll for arrow, page and home/end keys; return True if the key was used"""
+        if key in (pygame.K_UP, pygame.K_w):
+            self.scroll_by(-RESUME_SCROLL_STEP)
+        elif key in (pygame.K_DOWN, pygame.K_s):
+            self.scroll_by(RESUME_SCROLL_STEP)
+        elif key == pygame.K_PAGEUP:
+            self.scroll_by(-self.rect.height)
+        elif key == pygame.K_PAGEDOWN:
+            self.scroll_by(self.rect.height)
+        elif key == pygame.K_HOME:
+            self.scroll_to(0)
+        elif key == pygame.K_END:
+            # Measuring every entry is cheap; only the last screenful gets rasterized
+            self.layout_until(float("inf"))
+            self.scroll_to(self.max_scroll())
+        else:
+            return False
+        return True
+
+    def render(self, screen):
+        window_top = self.scroll - self.overscan
+        window_bottom = self.scroll + self.rect.height + self.overscan
+        self.layout_until(window_bottom)
+        first = max(0, bisect.bisect_right(self.tops, window_top) - 1)
+        last = bisect.bisect_left(self.tops, window_bottom)
+        for index in [index for index in self.surfaces if not first <= index < last]:
+            del self.surfaces[index]
+
+        clip = screen.get_clip()
+        screen.set_clip(self.rect)
+        for index in range(first, last):
+            surface = self.surfaces.get(index)
+            if surface is None:
+                # Overscan entries are rasterized too, before they scroll into view
+                surface = self.surfaces[index] = self.rasterize(index)
+            screen.blit(surface, (self.rect.x, self.rect.y + self.tops[index] - self.scroll))
+        screen.set_clip(clip)
+        self.render_scrollbar(screen)
+
+    def render_scrollbar(self, screen):
+        if len(self.tops) == len(self.entries):
+            total = self.laid_out_height
+        else:
+            # Unmeasured entries are assumed to be as tall as the average so far
+            total = self.laid_out_height / len(self.tops) * len(self.entries)
+        if total <= self.rect.height:
+            return
+        track = pygame.Rect(self.rect.right + 20, self.rect.y, 6, self.rect.height)
+        thumb_height = max(20, int(track.height * self.rect.height / total))
+        thumb_y = track.y + int((track.height - thumb_height) * min(1.0, self.scroll / (total - self.rect.height)))
+        pygame.draw.rect(screen, DARK_GRAY, track)
+        pygame.draw.rect(screen, YELLOW, (track.x, thumb_y, track.width, thumb_height))
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "laid_out": len(self.tops),
+            "cached_surfaces": len(self.surfaces),
+            "rasterized": self.rasterized,
+        }
 
 
 # Resume content display
-class ResumeDisplay:
+class ResumeDisplay(CachedLayer):
+    # Sections shown as scrolling lists: section -> entry -> (heading, subheading, body)
+    LIST_SECTIONS = {
+        "Experience": lambda job: (f"{job['title']} at {job['company']}", job['duration'], job['description']),
+        "Education": lambda edu: (edu['degree'], f"{edu['school']} - {edu['year']}", edu['details']),
+        "Projects": lambda project: (project['name'], f"Technologies: {project['tech']}", project['description']),
+    }
+    list_rect = pygame.Rect(80, 100, SCREEN_WIDTH - 160, SCREEN_HEIGHT - 160)
+    max_layers = 8  # Every section's page stays baked
+
     def __init__(self):
+        super().__init__()
         self.active = False
         self.current_section = None
         self.current_data = None
+        # Scrolling lists by section, kept so reopening a section keeps its place
+        self.lists = {}
 
     def show_section(self, section, data):
         self.active = True
@@ -187,50 +487,79 @@ class ResumeDisplay:
     def close(self):
         self.active = False
 
+    def invalidate(self, section=None):
+        """Drop baked pages and lists for one section, or all of them when section is None"""
+        if section is None:
+            self.invalidate_layer()
+            self.lists.clear()
+            return
+        self.invalidate_layer(lambda state: state[0] == section)
+        self.lists.pop(section, None)
+
+    def refresh(self, section, data):
+        """Take reloaded data for a section, rebuilding only that section's page and list"""
+        old_list = self.lists.get(section)
+        self.invalidate(section)
+        if self.current_section == section:
+            self.current_data = data
+            # Stay where the reader was rather than jumping back to the top
+            if old_list is not None and self.current_list is not None:
+                self.current_list.scroll_to(old_list.scroll)
+
+    @property
+    def current_list(self):
+        """The scrolling list for the current section, or None if it is not a list section"""
+        entry_fields = self.LIST_SECTIONS.get(self.current_section)
+        if entry_fields is None:
+            return None
+        resume_list = self.lists.get(self.current_section)
+        if resume_list is None or resume_list.data is not self.current_data:
+            entries = [entry_fields(entry) for entry in self.current_data]
+            resume_list = self.lists[self.current_section] = ResumeList(self.current_data, entries, self.list_rect)
+        return resume_list
+
+    def handle_key(self, key):
+        resume_list = self.current_list
+        return resume_list is not None and resume_list.handle_key(key)
+
+    def scroll_by(self, delta):
+        resume_list = self.current_list
+        if resume_list is not None:
+            resume_list.scroll_by(delta)
+
+    def layer_state(self):
+        # Reloaded data is invalidated by section, so identity tells shown data sets apart
+        return (self.current_section, id(self.current_data))
+
     def render(self, screen):
         if not self.active:
             return
 
+        screen.blit(self.get_layer(screen.get_size()), (0, 0))
+        resume_list = self.current_list
+        if resume_list is not None:
+            resume_list.render(screen)
+
+    def compose_layer(self, screen):
         # Semi-transparent background
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 128, 200))
-        screen.blit(overlay, (0, 0))
+        screen.fill((0, 0, 128, 200))
 
         # Draw section title
-        title_text = create_pixel_text(self.current_section, large_font, WHITE)
+        title_text = create_pixel_text(self.current_section, config.large_font, WHITE)
         screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 30))
 
-        # Draw content based on section type
+        # Draw content based on section type. The data was validated when it was loaded;
+        # list section entries scroll, so ResumeList draws them over the page every frame.
         if self.current_section == "Skills":
-            if self.current_data and isinstance(self.current_data, list):
-                self.render_skills(screen)
-            else:
-                self.render_error(screen, "Skills data is missing or invalid.")
-        elif self.current_section == "Experience":
-            if self.current_data and isinstance(self.current_data, list):
-                self.render_experience(screen)
-            else:
-                self.render_error(screen, "Experience data is missing or invalid.")
-        elif self.current_section == "Education":
-            if self.current_data and isinstance(self.current_data, list):
-                self.render_education(screen)
-            else:
-                self.render_error(screen, "Education data is missing or invalid.")
-        elif self.current_section == "Projects":
-            if self.current_data and isinstance(self.current_data, list):
-                self.render_projects(screen)
-            else:
-                self.render_error(screen, "Projects data is missing or invalid.")
+            self.render_skills(screen)
         elif self.current_section == "Contact":
-            if self.current_data and isinstance(self.current_data, dict):
-                self.render_contact(screen)
-            else:
-                self.render_error(screen, "Contact data is missing or invalid.")
+            self.render_contact(screen)
         elif self.current_section == "About Me":
             self.render_about(screen)
 
         # Draw navigation instructions
-        nav_text = create_pixel_text("ESC: Back", small_font, WHITE)
+        nav_label = "UP/DOWN PGUP/PGDN: Scroll   ESC: Back" if self.current_section in self.LIST_SECTIONS else "ESC: Back"
+        nav_text = create_pixel_text(nav_label, config.small_font, WHITE)
         screen.blit(nav_text, (SCREEN_WIDTH - nav_text.get_width() - 20, SCREEN_HEIGHT - 40))
 
     def render_skills(self, screen):
@@ -238,7 +567,7 @@ class ResumeDisplay:
         max_bar_width = 250
 
         for skill in self.current_data:
-            skill_name = create_pixel_text(f"{skill['name']}", medium_font, WHITE)
+            skill_name = create_pixel_text(f"{skill['name']}", config.medium_font, WHITE)
             screen.blit(skill_name, (150, y_offset))
 
             # Draw skill level bar
@@ -247,74 +576,11 @@ class ResumeDisplay:
             pygame.draw.rect(screen, YELLOW, (300, y_offset + 5, bar_width, 20))
 
             # Draw percentage
-            level_text = create_pixel_text(f"{skill['level']}%", small_font, WHITE)
+            level_text = create_pixel_text(f"{skill['level']}%", config.small_font, WHITE)
             screen.blit(level_text, (300 + max_bar_width + 10, y_offset + 5))
 
             y_offset += 40
 
-    def render_experience(self, screen):
-        y_offset = 100
-
-        for job in self.current_data:
-            # Title and company
-            title_text = create_pixel_text(f"{job['title']} at {job['company']}", medium_font, WHITE)
-            screen.blit(title_text, (80, y_offset))
-
-            # Duration
-            duration_text = create_pixel_text(job['duration'], small_font, YELLOW)
-            screen.blit(duration_text, (80, y_offset + 30))
-
-            # Description
-            desc_text = create_pixel_text(job['description'], small_font, WHITE)
-            screen.blit(desc_text, (80, y_offset + 55))
-
-            # Divider
-            pygame.draw.line(screen, GRAY, (80, y_offset + 85), (SCREEN_WIDTH - 80, y_offset + 85), 2)
-
-            y_offset += 100
-
-    def render_education(self, screen):
-        y_offset = 100
-
-        for edu in self.current_data:
-            # Degree
-            degree_text = create_pixel_text(edu['degree'], medium_font, WHITE)
-            screen.blit(degree_text, (80, y_offset))
-
-            # School and year
-            school_text = create_pixel_text(f"{edu['school']} - {edu['year']}", small_font, YELLOW)
-            screen.blit(school_text, (80, y_offset + 30))
-
-            # Details
-            details_text = create_pixel_text(edu['details'], small_font, WHITE)
-            screen.blit(details_text, (80, y_offset + 55))
-
-            # Divider
-            pygame.draw.line(screen, GRAY, (80, y_offset + 85), (SCREEN_WIDTH - 80, y_offset + 85), 2)
-
-            y_offset += 100
-
-    def render_projects(self, screen):
-        y_offset = 100
-
-        for project in self.current_data:
-            # Project name
-            name_text = create_pixel_text(project['name'], medium_font, WHITE)
-            screen.blit(name_text, (80, y_offset))
-
-            # Technologies
-            tech_text = create_pixel_text(f"Technologies: {project['tech']}", small_font, YELLOW)
-            screen.blit(tech_text, (80, y_offset + 30))
-
-            # Description
-            desc_text = create_pixel_text(project['description'], small_font, WHITE)
-            screen.blit(desc_text, (80, y_offset + 55))
-
-            # Divider
-            pygame.draw.line(screen, GRAY, (80, y_offset + 85), (SCREEN_WIDTH - 80, y_offset + 85), 2)
-
-            y_offset += 100
-
     def render_contact(self, screen):
         y_offset = 120
         spacing = 50
@@ -324,10 +590,10 @@ class ResumeDisplay:
             display_key = key.capitalize()
 
             # Draw key-value pair
-            key_text = create_pixel_text(f"{display_key}:", medium_font, YELLOW)
+            key_text = create_pixel_text(f"{display_key}:", config.medium_font, YELLOW)
             screen.blit(key_text, (150, y_offset))
 
-            value_text = create_pixel_text(value, medium_font, WHITE)
+            value_text = create_pixel_text(value, config.medium_font, WHITE)
             screen.blit(value_text, (300, y_offset))
 
             y_offset += spacing
@@ -337,10 +603,10 @@ class ResumeDisplay:
         player_title = RESUME_DATA["PLAYER_TITLE"]
         personal_summary = RESUME_DATA["PERSONAL_SUMMARY"]
 
-        title_text = create_pixel_text(player_name, large_font, WHITE)
+        title_text = create_pixel_text(player_name, config.large_font, WHITE)
         screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 100))
 
-        role_text = create_pixel_text(player_title, medium_font, YELLOW)
+        role_text = create_pixel_text(player_title, config.medium_font, YELLOW)
         screen.blit(role_text, (SCREEN_WIDTH // 2 - role_text.get_width() // 2, 150))
 
         # Split summary into lines for display
@@ -350,7 +616,7 @@ class ResumeDisplay:
 
         for word in words:
             test_line = current_line + " " + word if current_line else word
-            if small_font.size(test_line)[0] < SCREEN_WIDTH - 160:
+            if config.small_font.size(test_line)[0] < SCREEN_WIDTH - 160:
                 current_line = test_line
             else:
                 lines.append(current_line)
@@ -361,14 +627,76 @@ class ResumeDisplay:
 
         y_offset = 200
         for line in lines:
-            line_text = create_pixel_text(line, small_font, WHITE)
+            line_text = create_pixel_text(line, config.small_font, WHITE)
             screen.blit(line_text, (SCREEN_WIDTH // 2 - line_text.get_width() // 2, y_offset))
             y_offset += 30
 
         # Display player sprite larger
-        scaled_player = pygame.transform.scale(get_player_frame(0), (128, 128))
+        scaled_player = pygame.transform.scale(get_player_frame('down', 1), (128, 128))
         screen.blit(scaled_player, (SCREEN_WIDTH // 2 - 64, 300))
 
-    def render_error(self, screen, message):
-        error_text = create_pixel_text(message, medium_font, YELLOW)
-        screen.blit(error_text, (SCREEN_WIDTH // 2 - error_text.get_width() // 2, 100))
\ No newline at end of file
+
+class ScreenFade:
+    """Fades to black, runs a callback while the screen is covered, then fades back in"""
+
+    def __init__(self, duration=AREA_FADE_MS):
+        self.duration = duration
+        self.active = False
+        self.elapsed = 0
+        self.on_covered = None
+        self.overlay = None
+
+    def start(self, on_covered):
+        self.active = True
+        self.elapsed = 0
+        self.on_covered = on_covered
+
+    def update(self, dt):
+        if not self.active:
+            return
+        half = self.duration / 2
+        was_covering = self.elapsed < half
+        self.elapsed += dt
+        if was_covering and self.elapsed >= half and self.on_covered:
+            # Whatever loads here is hidden behind the black frame
+            self.on_covered()
+            self.on_covered = None
+        if self.elapsed >= self.duration:
+            self.active = False
+
+    @property
+    def animating(self):
+        return self.active
+
+    @property
+    def alpha(self):
+        half = self.duration / 2
+        progress = self.elapsed / half if self.elapsed < half else (self.duration - self.elapsed) / half
+        return int(255 * max(0.0, min(1.0, progress)))
+
+    def render(self, screen):
+        if self.overlay is None or self.overlay.get_size() != screen.get_size():
+            self.overlay = pygame.Surface(screen.get_size())
+            self.overlay.fill(BLACK)
+        self.overlay.set_alpha(self.alpha)
+        screen.blit(self.overlay, (0, 0))
+
+
+# Owns the UI layers and draws the active ones in stacking order
+class UICompositor:
+    def __init__(self, *layers):
+        self.layers = list(layers)
+
+    @property
+    def active(self):
+        return any(layer.active for layer in self.layers)
+
+    @property
+    def animating(self):
+        """True while a layer changes on its own (typewriter text, fades); the rest only change on input"""
+        return any(getattr(layer, "animating", False) for layer in self.layers)
+
+    def render(self, screen):
+        for layer in self.layers:
+            if layer.active:
+                layer.render(screen)
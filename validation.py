@@ -0,0 +1,12 @@
+# validation.py - Small helpers shared by the data file loaders
+
+
+def expect(condition, where, message):
+    """Raise ValueError naming where in the file the check failed"""
+    if not condition:
+        raise ValueError(f"{where}: {message}")
+
+
+def is_int(value):
+    """True for ints, but not for bools (which JSON and YAML also produce)"""
+    return isinstance(value, int) and not isinstance(value, bool)
@@ -0,0 +1,203 @@
+# world_loader.py - Loads the world file, validates it and caches the compiled form
+#
+# world.json holds a tile legend (one character per TILESET name) and, per area,
+# a background colour, tile layers drawn as rows of legend characters (space is
+# empty) and a list of objects. An object has a name, x, y, width and height in
+# pixels plus exactly one of:
+#   "sprite": region name from sprites.SPRITE_REGIONS
+#   "npc": index into the NPC sheet, within the rows pack_assets.py packs
+#   "animation": sprites.FRAME_SEQUENCES name, played on a loop
+#   "warp": target area name, with "spawn": [x, y] in that area
+# and an optional interaction "text". An area may also set "crowd" to the
+# number of wandering NPCs (crowd.py) scattered over its free ground.
+#
+# The compiled form has tile names resolved to TILESET indices, a precomputed
+# collision grid and the sprite regions each area needs. It is stored in
+# WORLD_CACHE_PATH under the hash of everything it was derived from, so later
+# starts skip JSON parsing and validation entirely.
+
+import hashlib
+import json
+import logging
+import marshal
+import zlib
+from config import WORLD_DATA_PATH, WORLD_CACHE_PATH, TILE_SIZE
+from sprites import SPRITE_REGIONS, NPC_PACKED_TOTAL, FRAME_SEQUENCES, sequence_regions
+from tilemap import TILESET, TILE_IDS
+from validation import expect, is_int
+
+logger = logging.getLogger(__name__)
+
+WORLD_FORMAT_VERSION = 1
+COMPILED_FORMAT = 3
+CACHE_MAGIC = b"RWLD"
+EMPTY_TILE = " "
+
+# TILESET index -> 1 if solid, for bytes.translate
+SOLID_TABLE = bytes(int(TILESET[i][1]) if i < len(TILESET) else 0 for i in range(256))
+
+
+def compile_legend(legend):
+    expect(isinstance(legend, dict) and legend, "tiles", "must be a non-empty object")
+    table = {EMPTY_TILE: 0}
+    for char, name in legend.items():
+        expect(len(char) == 1 and char != EMPTY_TILE, f"tiles.{char!r}", "keys must be single non-space characters")
+        expect(name in TILE_IDS, f"tiles.{char!r}", f"unknown tile {name!r}")
+        table[char] = TILE_IDS[name]
+    return table
+
+
+def compile_layers(where, layers, legend):
+    """Return (width, height, ((layer name, tile bytes), ...), solid bytes)"""
+    expect(isinstance(layers, list) and layers, where, "needs at least one layer")
+    translation = str.maketrans({char: chr(tile) for char, tile in legend.items()})
+    width = height = None
+    compiled = []
+    solid = 0
+    for i, layer in enumerate(layers):
+        at = f"{where}[{i}]"
+        expect(isinstance(layer, dict) and isinstance(layer.get("name"), str), at, "needs a name")
+        expect(all(layer["name"] != name for name, _ in compiled), at, f"duplicate layer {layer['name']!r}")
+        rows = layer.get("rows")
+        expect(isinstance(rows, list) and rows and all(isinstance(row, str) for row in rows), at,
+               "rows must be a non-empty list of strings")
+        if width is None:
+            width, height = len(rows[0]), len(rows)
+            expect(width > 0, at, "rows must not be empty")
+        expect(len(rows) == height, at, f"has {len(rows)} rows, expected {height}")
+        for y, row in enumerate(rows):
+            expect(len(row) == width, f"{at}.rows[{y}]", f"has {len(row)} tiles, expected {width}")
+            unknown = set(row) - legend.keys()
+            expect(not unknown, f"{at}.rows[{y}]", f"unknown tile characters {''.join(sorted(unknown))!r}")
+        tiles = "".join(rows).translate(translation).encode("latin-1")
+        # OR the per-layer solid flags together as one big integer
+        solid |= int.from_bytes(tiles.translate(SOLID_TABLE), "big")
+        compiled.append((layer["name"], tiles))
+    return width, height, tuple(compiled), solid.to_bytes(width * height, "big")
+
+
+def compile_object(where, obj, area_sizes):
+    expect(isinstance(obj, dict), where, "must be an object")
+    expect(isinstance(obj.get("name"), str), where, "needs a name")
+    for key in ("x", "y", "width", "height"):
+        expect(is_int(obj.get(key)), where, f"{key} must be an integer")
+    expect(obj["width"] > 0 and obj["height"] > 0, where, "width and height must be positive")
+    kinds = [key for key in ("sprite", "npc", "animation", "warp") if key in obj]
+    expect(len(kinds) == 1, where, "needs exactly one of sprite, npc, animation or warp")
+    text = obj.get("text")
+    expect(text is None or isinstance(text, str), where, "text must be a string")
+
+    sprite, npc, animation, warp, spawn = None, -1, None, None, None
+    if "sprite" in obj:
+        sprite = obj["sprite"]
+        expect(sprite in SPRITE_REGIONS, where, f"unknown sprite {sprite!r}")
+    elif "npc" in obj:
+        npc = obj["npc"]
+        expect(is_int(npc) and 0 <= npc < NPC_PACKED_TOTAL, where, f"npc must be 0-{NPC_PACKED_TOTAL - 1}")
+    elif "animation" in obj:
+        animation = obj["animation"]
+        expect(animation in FRAME_SEQUENCES, where, f"unknown animation {animation!r}")
+        expect(sequence_regions(animation), where, f"animation {animation!r} has no frames")
+    else:
+        warp = obj["warp"]
+        expect(warp in area_sizes, where, f"warp to unknown area {warp!r}")
+        spawn = obj.get("spawn")
+        expect(isinstance(spawn, list) and len(spawn) == 2 and all(is_int(v) for v in spawn), where,
+               "spawn must be [x, y]")
+        width, height = area_sizes[warp]
+        expect(0 <= spawn[0] < width and 0 <= spawn[1] < height, where, f"spawn is outside {warp!r}")
+        spawn = tuple(spawn)
+    return (obj["name"], obj["x"], obj["y"], obj["width"], obj["height"], sprite, npc, animation, text, warp, spawn)
+
+
+def compile_world(data):
+    """Validate parsed world data and resolve it into the compiled form; raises ValueError"""
+    expect(isinstance(data, dict), "world", "must be an object")
+    expect(data.get("version") == WORLD_FORMAT_VERSION, "version", f"must be {WORLD_FORMAT_VERSION}")
+    legend = compile_legend(data.get("tiles"))
+    areas = data.get("areas")
+    expect(isinstance(areas, dict) and areas, "areas", "must be a non-empty object")
+    expect(data.get("start_area") in areas, "start_area", "must name one of the areas")
+
+    compiled = {}
+    for name, area in areas.items():
+        where = f"areas.{name}"
+        expect(isinstance(area, dict), where, "must be an object")
+        background = area.get("background")
+        expect(isinstance(background, list) and len(background) == 3
+               and all(is_int(v) and 0 <= v <= 255 for v in background), f"{where}.background", "must be [r, g, b]")
+        crowd = area.get("crowd", 0)
+        expect(is_int(crowd) and crowd >= 0, f"{where}.crowd", "must be a non-negative integer")
+        width, height, layers, solid = compile_layers(f"{where}.layers", area.get("layers"), legend)
+        compiled[name] = {"background": tuple(background), "width": width, "height": height,
+                          "layers": layers, "solid": solid, "crowd": crowd}
+
+    # Warps are checked against every area's size, so objects come second
+    area_sizes = {name: (area["width"] * TILE_SIZE, area["height"] * TILE_SIZE) for name, area in compiled.items()}
+    for name, area in areas.items():
+        objects = area.get("objects", [])
+        expect(isinstance(objects, list), f"areas.{name}.objects", "must be a list")
+        compiled_objects = tuple(compile_object(f"areas.{name}.objects[{i}]", obj, area_sizes)
+                                 for i, obj in enumerate(objects))
+        regions = {TILESET[tile][0] for _, tiles in compiled[name]["layers"] for tile in set(tiles) if tile}
+        for obj in compiled_objects:
+            if obj[5]:
+                regions.add(obj[5])
+            if obj[6] >= 0:
+                regions.add('npcs')
+            if obj[7]:
+                regions.update(sequence_regions(obj[7]))
+        if compiled[name]["crowd"]:
+            regions.add('crowd')
+        compiled[name]["objects"] = compiled_objects
+        compiled[name]["regions"] = tuple(sorted(regions))
+    return {"start_area": data["start_area"], "areas": compiled}
+
+
+def world_digest(source):
+    """Hash of the world file plus every table the compiled form depends on"""
+    digest = hashlib.sha256(source)
+    digest.update(repr((COMPILED_FORMAT, marshal.version, TILESET, sorted(SPRITE_REGIONS), NPC_PACKED_TOTAL)).encode())
+    return digest.digest()
+
+
+def load_compiled_cache(digest, path=WORLD_CACHE_PATH):
+    try:
+        with open(path, "rb") as f:
+            blob = f.read()
+    except OSError:
+        return None
+    header = CACHE_MAGIC + digest
+    if not blob.startswith(header):
+        return None
+    try:
+        return marshal.loads(zlib.decompress(blob[len(header):]))
+    except (ValueError, EOFError, TypeError, zlib.error) as e:
+        logger.warning(f"Ignoring unreadable world cache: {str(e)}")
+        return None
+
+
+def save_compiled_cache(digest, compiled, path=WORLD_CACHE_PATH):
+    try:
+        with open(path, "wb") as f:
+            f.write(CACHE_MAGIC + digest + zlib.compress(marshal.dumps(compiled)))
+    except OSError as e:
+        logger.warning(f"Could not write world cache: {str(e)}")
+
+
+def load_world_definition(path=WORLD_DATA_PATH, cache_path=WORLD_CACHE_PATH):
+    """Return the compiled world, from the cache when the world file is unchanged"""
+    with open(path, "rb") as f:
+        source = f.read()
+    digest = world_digest(source)
+    compiled = load_compiled_cache(digest, cache_path)
+    if compiled is not None:
+        logger.info(f"Using compiled world cache {cache_path}")
+        return compiled
+    try:
+        compiled = compile_world(json.loads(source))
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from e
+    save_compiled_cache(digest, compiled, cache_path)
+    logger.info(f"Compiled {path} ({len(compiled['areas'])} areas)")
+    return compiled